@@ -5,6 +5,16 @@ import subprocess
 import platform
 import re
 
+_SYSTEM_PLATFORM = platform.system().lower()
+_IS_WINDOWS = _SYSTEM_PLATFORM.startswith("win")
+_IS_AIX = _SYSTEM_PLATFORM == "aix"
+
+# Patterns used by the output parsers, compiled once at import
+_CLIENT_VERSION_RE = re.compile(r'Client Version\s+(\d+),\s*Release\s+(\d+),\s*Level\s+(\d+)\.(\d+)')
+_CLIENT_NAME_RE = re.compile(r'(IBM Storage Protect|IBM Spectrum Protect|Tivoli Storage Manager)')
+_API_VERSION_RE = re.compile(r'API Version\s+(\d+\.\d+\.\d+\.\d+)')
+_SERVER_ADDRESS_RE = re.compile(r'(\d+\.\d+\.\d+\.\d+):(\d+)')
+
 # Try to import Ansible (for Linux/normal use)
 HAS_ANSIBLE = False
 try:
@@ -36,12 +46,12 @@ class DsmcAdapterExtended(DsmcAdapter):
     Extended DsmcAdapter to add support for various query commands with comma-delimited output.
     """
 
-    def run_command(self, command, auto_exit=True, dataonly=True, exit_on_fail=True):
+    def run_command(self, args, auto_exit=True, dataonly=True, exit_on_fail=True):
         """
         Run a DSMC command with appropriate parameters.
         
         Args:
-            command: The DSMC command to execute
+            args: The DSMC arguments as a list, e.g. ['query', 'session']
             auto_exit: Whether to automatically exit after command execution
             dataonly: Whether to use -dataonly=yes parameter (ignored for query session)
             exit_on_fail: Whether to fail on command error
@@ -50,9 +60,8 @@ class DsmcAdapterExtended(DsmcAdapter):
             tuple: (return_code, stdout, stderr)
         """
         # Build the command based on platform
-        system_platform = platform.system().lower()
-        is_windows = system_platform.startswith("win")
-        is_aix = system_platform == "aix"
+        is_windows = _IS_WINDOWS
+        is_aix = _IS_AIX
         
         if is_windows:
             dsmc_cmd = 'dsmc.exe'
@@ -72,9 +81,9 @@ class DsmcAdapterExtended(DsmcAdapter):
         
         # Build full command - dsmc query session works WITHOUT parameters
         # It reads configuration from dsm.opt/dsm.sys
-        full_command = f'{dsmc_cmd} {command}'
+        argv = [dsmc_cmd, *args]
         
-        self.json_output['command'] = full_command
+        self.json_output['command'] = ' '.join(argv)
         
         # Prepare input for interactive prompts (user ID and password)
         input_data = f"{user_id}\n{password}\n"
@@ -89,8 +98,7 @@ class DsmcAdapterExtended(DsmcAdapter):
         
         try:
             result = subprocess.run(
-                full_command,
-                shell=True,
+                argv,
                 input=input_data,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -123,6 +131,10 @@ class DsmcAdapterExtended(DsmcAdapter):
                     **self.json_output
                 )
             return e.returncode, None, e.stderr
+        except OSError as e:
+            if exit_on_fail:
+                self.fail_json(msg=f"Unable to run {dsmc_cmd}: {e}", rc=127, **self.json_output)
+            return 127, "", str(e)
     
     def _find_dsmc_aix(self):
         """
@@ -163,17 +175,17 @@ class DSMCParser:
         version_info = {}
         
         # Extract version from output
-        version_match = re.search(r'Client Version\s+(\d+),\s*Release\s+(\d+),\s*Level\s+(\d+)\.(\d+)', dsmc_output)
+        version_match = _CLIENT_VERSION_RE.search(dsmc_output)
         if version_match:
             version_info['client_version'] = f"{version_match.group(1)}.{version_match.group(2)}.{version_match.group(3)}.{version_match.group(4)}"
         
         # Extract client name
-        name_match = re.search(r'(IBM Storage Protect|IBM Spectrum Protect|Tivoli Storage Manager)', dsmc_output)
+        name_match = _CLIENT_NAME_RE.search(dsmc_output)
         if name_match:
             version_info['client_name'] = name_match.group(1)
         
         # Extract API version if available
-        api_match = re.search(r'API Version\s+(\d+\.\d+\.\d+\.\d+)', dsmc_output)
+        api_match = _API_VERSION_RE.search(dsmc_output)
         if api_match:
             version_info['api_version'] = api_match.group(1)
         
@@ -201,7 +213,7 @@ class DSMCParser:
                     session_info['server_name'] = parts[0].strip().replace('"', '')
             
             if 'Server address' in line or 'Server Address' in line:
-                match = re.search(r'(\d+\.\d+\.\d+\.\d+):(\d+)', line)
+                match = _SERVER_ADDRESS_RE.search(line)
                 if match:
                     session_info['server_address'] = match.group(1)
                     session_info['server_port'] = match.group(2)
@@ -385,9 +397,11 @@ class DSMCParser:
         
         # Extract additional info from dsmc output if available
         if 'Operating system' in dsmc_output:
-            os_match = re.search(r'Operating system\s*:\s*(.+)', dsmc_output)
-            if os_match:
-                system_info['client_os'] = os_match.group(1).strip()
+            for line in dsmc_output.splitlines():
+                label, sep, value = line.partition(':')
+                if sep and label.rstrip().endswith('Operating system') and value.strip():
+                    system_info['client_os'] = value.strip()
+                    break
         
         return system_info
 
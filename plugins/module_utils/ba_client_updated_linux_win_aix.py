@@ -5,15 +5,43 @@ IBM Storage Protect BA Client Utility Module
 Supports Windows, Linux, and AIX
 """
 
+import functools
+import glob
 import os
 import platform
 import shutil
-from distutils.version import LooseVersion
+
+try:
+    import winreg  # type: ignore
+except ImportError:
+    winreg = None
+
+MIN_DISK_MB = 1500
+
+
+@functools.lru_cache(maxsize=128)
+def _version_key(version):
+    return tuple(int(p) if p.isdigit() else p for p in str(version).split("."))
+
+
+def _same_version(a, b):
+    """True when a and b differ only by trailing zero parts (8.1.25 == 8.1.25.0)."""
+    ka, kb = _version_key(str(a)), _version_key(str(b))
+    width = max(len(ka), len(kb))
+    return ka + (0,) * (width - len(ka)) == kb + (0,) * (width - len(kb))
 
 
 class BAClientHelper:
     def __init__(self, module):
         self.module = module
+        system = platform.system().lower()
+        # OS predicates are queried on nearly every step, classify once
+        self._is_windows = system.startswith("win")
+        self._is_aix = system == "aix"
+        self._is_linux = system == "linux"
+        self._arch = platform.machine()
+        # (installed, version); cleared by install/uninstall
+        self._installed_cache = None
 
     # -------------------------
     # Generic helpers
@@ -43,20 +71,20 @@ class BAClientHelper:
     # OS detection
     # -------------------------
     def is_windows(self):
-        return platform.system().lower().startswith("win")
+        return self._is_windows
 
     def is_aix(self):
-        return platform.system().upper() == "AIX"
+        return self._is_aix
 
     def is_linux(self):
-        return platform.system().lower() == "linux"
+        return self._is_linux
 
     # -------------------------
     # Version helpers
     # -------------------------
     def is_newer_version(self, target, current):
         try:
-            return LooseVersion(target) > LooseVersion(current)
+            return _version_key(str(target)) > _version_key(str(current))
         except Exception:
             return target != current
 
@@ -64,12 +92,17 @@ class BAClientHelper:
     # Installed check
     # -------------------------
     def check_installed(self):
+        if self._installed_cache is None:
+            self._installed_cache = self._query_installed()
+        return self._installed_cache
+
+    def _query_installed(self):
         if self.is_windows():
-            cmd = 'reg query "HKLM\\SOFTWARE\\IBM\\ADSM\\CurrentVersion" /v PTF'
-            rc, out, _ = self.run_cmd(cmd, check_rc=False)
-            if rc == 0 and "PTF" in out:
-                return True, out.strip().split()[-1]
-            return False, None
+            try:
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\IBM\ADSM\CurrentVersion") as key:
+                    return True, winreg.QueryValueEx(key, "PTF")[0]
+            except OSError:
+                return False, None
 
         if self.is_aix():
             rc, _, _ = self.run_cmd(
@@ -81,18 +114,16 @@ class BAClientHelper:
             return False, None
 
         # Linux
-        rc, out, _ = self.run_cmd("rpm -q TIVsm-BA", check_rc=False)
+        # rpm formats the version itself; works for any arch suffix
+        rc, out, _ = self.run_cmd(["rpm", "-q", "--qf", "%{VERSION}.%{RELEASE}\n", "TIVsm-BA"], check_rc=False)
         if rc == 0:
-            ver = out.strip().replace("TIVsm-BA-", "").split(".x86_64")[0]
-            return True, ver.replace("-", ".")
+            return True, out.splitlines()[0].strip() if out.strip() else None
         return False, None
 
     # -------------------------
     # System prereqs
     # -------------------------
     def verify_system_prereqs(self):
-        min_disk_mb = 1500
-
         if not self.is_windows():
             try:
                 if os.geteuid() != 0:
@@ -103,10 +134,15 @@ class BAClientHelper:
                 pass
 
         if self.is_windows():
-            rc, _, _ = self.run_cmd(
-                'whoami /groups | find "Administrators"', check_rc=False
-            )
-            if rc != 0:
+            import ctypes
+            try:
+                is_admin = bool(ctypes.windll.shell32.IsUserAnAdmin())
+            except (AttributeError, OSError):
+                rc, _, _ = self.run_cmd(
+                    'whoami /groups | find "Administrators"', use_unsafe_shell=True, check_rc=False
+                )
+                is_admin = rc == 0
+            if not is_admin:
                 self.module.fail_json(
                     msg="Admin privileges required to install BA Client on Windows"
                 )
@@ -119,9 +155,9 @@ class BAClientHelper:
                     msg=f"Incompatible AIX architecture: {aix_arch}. POWER required."
                 )
         elif self.is_linux():
-            if platform.machine() != "x86_64":
+            if self._arch != "x86_64":
                 self.module.fail_json(
-                    msg=f"Incompatible Linux architecture: {platform.machine()}"
+                    msg=f"Incompatible Linux architecture: {self._arch}"
                 )
 
         check_path = "/usr" if self.is_aix() else "/"
@@ -133,11 +169,11 @@ class BAClientHelper:
                 msg=f"Unable to determine disk space for {check_path}: {str(e)}"
             )
 
-        if free_mb < min_disk_mb:
+        if free_mb < MIN_DISK_MB:
             self.module.fail_json(
                 msg=(
                     f"Insufficient disk space on {check_path}. "
-                    f"Required {min_disk_mb} MB, available {free_mb} MB"
+                    f"Required {MIN_DISK_MB} MB, available {free_mb} MB"
                 )
             )
 
@@ -150,14 +186,14 @@ class BAClientHelper:
 
         os.makedirs(dest, exist_ok=True)
 
-        if self.is_aix():
-            cmd = f'cd "{dest}" && tar -xf "{src}"'
-        else:
-            cmd = f'tar -xf "{src}" -C "{dest}"'
-
-        rc, _, err = self.run_cmd(cmd, use_unsafe_shell=True, check_rc=False)
-        if rc != 0:
-            self.module.fail_json(msg=f"Extraction failed: {err}")
+        # In-process on both Linux and AIX: no tar (or cd && tar shell) to spawn
+        import tarfile
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        try:
+            with tarfile.open(src, "r:*") as tf:
+                tf.extractall(dest, **extract_kwargs)
+        except (OSError, tarfile.TarError) as e:
+            self.module.fail_json(msg=f"Extraction failed: {e}")
 
         return dest
 
@@ -165,6 +201,7 @@ class BAClientHelper:
     # Install
     # -------------------------
     def install_ba_client(self, package_source, install_path, temp_dir):
+        self._installed_cache = None
         if self.is_windows():
             if package_source.lower().endswith(".msi"):
                 cmd = f'msiexec.exe /i "{package_source}" /qn'
@@ -176,15 +213,16 @@ class BAClientHelper:
         if self.is_aix():
             extract_dir = "/usr/tsm_ba_aix_extract"
             self.extract_package(package_source, extract_dir)
-            cmd = f'installp -acXYgd "{extract_dir}" all'
-            self.run_cmd(cmd, use_unsafe_shell=True)
+            self.run_cmd(["installp", "-acXYgd", extract_dir, "all"])
             self.module.warn("BA Client installed successfully on AIX")
             return True
 
         extract_dir = temp_dir
         rpm_dir = self.extract_package(package_source, extract_dir)
-        cmd = f'cd "{rpm_dir}" && rpm -ivh --force --nodeps *.rpm'
-        self.run_cmd(cmd, use_unsafe_shell=True)
+        rpm_files = sorted(glob.glob(os.path.join(rpm_dir, "*.rpm")))
+        if not rpm_files:
+            self.module.fail_json(msg=f"No RPM files found under {rpm_dir}")
+        self.run_cmd(["rpm", "-i", "--force", "--nodeps"] + rpm_files)
         self.module.warn("BA Client installed successfully on Linux")
         return True
 
@@ -204,6 +242,7 @@ class BAClientHelper:
     # Uninstall
     # -------------------------
     def uninstall_ba_client(self):
+        self._installed_cache = None
         if self.is_windows():
             self.run_cmd(
                 'wmic product where "Name like \'%%Tivoli%%\'" call uninstall /nointeractive',
@@ -227,7 +266,7 @@ class BAClientHelper:
             )
             return True
 
-        self.run_cmd("rpm -e TIVsm-BA", check_rc=False)
+        self.run_cmd(["rpm", "-e", "TIVsm-BA"], check_rc=False)
         return True
 
     # -------------------------
@@ -246,6 +285,9 @@ class BAClientHelper:
         if not installed:
             self.module.fail_json(msg="BA Client not installed; cannot upgrade")
 
+        if installed_version and _same_version(installed_version, desired_version):
+            return {"changed": False, "msg": f"BA Client is already at version {desired_version}"}
+
         self.log(f"Upgrading BA Client from {installed_version} to {desired_version}")
         self.uninstall_ba_client()
         self.install_ba_client(package_source, install_path, temp_dir)
@@ -1,17 +1,49 @@
 # -*- coding: utf-8 -*-
 # IBM Storage Protect BA Client Utility Module
 
+import functools
+import glob
+import hashlib
+import locale
 import os
 import platform
 import re
 import shutil
+import signal
 import subprocess
+from typing import TYPE_CHECKING
 
 IS_WINDOWS = platform.system().lower().startswith("win")
 
+try:
+    import winreg  # type: ignore
+except ImportError:
+    winreg = None
+
+RPM_BACKUP_ARCHIVE = "ba_client_rpms.tar"
+UPGRADE_BACKUP_DIR = "backup_old_rpms"  # under temp_dir
+MIN_DISK_MB = 1500
+COMPATIBLE_ARCH = frozenset(("x86_64", "AMD64"))
+UNINSTALL_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+
+# Default stanzas written by configure_ba_client
+DSM_SYS_DEFAULTS = (
+    "SErvername  TSM_SERVER\n"
+    "TCPServeraddress  your.server.address\n"
+    "TCPPort           1500\n"
+)
+DSM_OPT_DEFAULTS = (
+    "SErvername  TSM_SERVER\n"
+    "NODename   your_node_name\n"
+    "PasswordDir /opt/tivoli/tsm/client/ba/bin\n"
+)
+
 if not IS_WINDOWS:
-    # Linux / normal Ansible environment
-    from ansible.module_utils.basic import AnsibleModule  # type: ignore
+    # Linux / normal Ansible environment. The helper only needs the module
+    # object its caller built, so the import is for type checkers only and
+    # standalone use does not pay for ansible.module_utils.basic.
+    if TYPE_CHECKING:
+        from ansible.module_utils.basic import AnsibleModule  # type: ignore
 else:
     # Windows-safe fallback for when Ansible isn't available
     class AnsibleModule:
@@ -20,11 +52,18 @@ else:
             self.params = {}
         def run_command(self, cmd, use_unsafe_shell=False):
             # simple subprocess wrapper
+            # capture raw bytes and decode each stream once; errors="replace"
+            # keeps localized installer output from raising UnicodeDecodeError
             if use_unsafe_shell:
-                completed = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                completed = subprocess.run(cmd, shell=True, capture_output=True)
             else:
-                completed = subprocess.run(cmd.split(), shell=False, capture_output=True, text=True)
-            return completed.returncode, completed.stdout, completed.stderr
+                completed = subprocess.run(cmd.split(), shell=False, capture_output=True)
+            encoding = locale.getpreferredencoding(False)
+            return (
+                completed.returncode,
+                completed.stdout.decode(encoding, errors="replace"),
+                completed.stderr.decode(encoding, errors="replace"),
+            )
         def fail_json(self, **kwargs):
             print(f"[Windows fail_json] {kwargs.get('msg', '')}")
             raise SystemExit(1)
@@ -37,25 +76,30 @@ else:
             print(f"[Windows LOG] {msg}")
 
 
+_VERSION_SEP_RE = re.compile(r'[.\-_]')
+
+
+@functools.lru_cache(maxsize=128)
+def _normalize_version(v):
+    # Split versions into parts and convert to integers where possible
+    parts = _VERSION_SEP_RE.split(v)
+    normalized = []
+    for part in parts:
+        try:
+            normalized.append(int(part))
+        except ValueError:
+            normalized.append(part)
+    return tuple(normalized)
+
+
 def compare_versions(version1, version2):
     """
     Compare two version strings.
     Returns: 1 if version1 > version2, -1 if version1 < version2, 0 if equal
     """
     try:
-        # Split versions into parts and convert to integers where possible
-        def normalize(v):
-            parts = re.split(r'[.\-_]', str(v))
-            normalized = []
-            for part in parts:
-                try:
-                    normalized.append(int(part))
-                except ValueError:
-                    normalized.append(part)
-            return normalized
-        
-        v1_parts = normalize(version1)
-        v2_parts = normalize(version2)
+        v1_parts = list(_normalize_version(str(version1)))
+        v2_parts = list(_normalize_version(str(version2)))
         
         # Pad shorter version with zeros
         max_len = max(len(v1_parts), len(v2_parts))
@@ -85,9 +129,141 @@ def compare_versions(version1, version2):
         return 0
 
 
+def _read_registry_value(subkey, name):
+    """Read a value below HKLM from the 64-bit registry view, or None if it is missing."""
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, subkey, 0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY) as key:
+            return winreg.QueryValueEx(key, name)[0]
+    except OSError:
+        return None
+
+
+def _iter_installed_products():
+    """
+    Yield (product_code, display_name, view) for every entry with a
+    DisplayName in the Windows Uninstall registry key, from both the 64-bit
+    view and the 32-bit (WOW6432Node) view that 32-bit installers register
+    in. Unlike Win32_Product this does not trigger an MSI consistency check
+    of every installed package.
+    """
+    seen = set()
+    for view in (winreg.KEY_WOW64_64KEY, winreg.KEY_WOW64_32KEY):
+        try:
+            root = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, UNINSTALL_KEY, 0, winreg.KEY_READ | view)
+        except OSError:
+            continue
+        with root:
+            index = 0
+            while True:
+                try:
+                    product_code = winreg.EnumKey(root, index)
+                except OSError:
+                    break
+                index += 1
+                # on 32-bit Windows both flags open the same view
+                if product_code in seen:
+                    continue
+                try:
+                    with winreg.OpenKey(root, product_code) as key:
+                        display_name = winreg.QueryValueEx(key, "DisplayName")[0]
+                except OSError:
+                    continue
+                seen.add(product_code)
+                yield product_code, display_name, view
+
+
+def _uninstall_command(product_key, view=None):
+    """
+    Return the silent uninstall command line registered for an Uninstall
+    subkey in the given registry view (default 64-bit), or None. Only
+    Windows Installer entries are keyed by their ProductCode, so msiexec /x
+    is used for those alone; setup.exe based entries are removed through
+    their own (Quiet)UninstallString.
+    """
+    values = {}
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, UNINSTALL_KEY + "\\" + product_key, 0,
+                            winreg.KEY_READ | (view or winreg.KEY_WOW64_64KEY)) as key:
+            for name in ("WindowsInstaller", "QuietUninstallString", "UninstallString"):
+                try:
+                    values[name] = winreg.QueryValueEx(key, name)[0]
+                except OSError:
+                    pass
+    except OSError:
+        return None
+    if values.get("WindowsInstaller") == 1:
+        return f'msiexec.exe /x {product_key} /qn /norestart'
+    return values.get("QuietUninstallString") or values.get("UninstallString")
+
+
+def _find_installed_product(name_substring):
+    """Return (product_code, display_name, view) for the first installed product whose DisplayName contains name_substring, or None."""
+    for product in _iter_installed_products():
+        if name_substring in product[1]:
+            return product
+    return None
+
+
+def _rpm_errors_for(pkg, err_lines):
+    """Return the rpm error lines naming pkg, not a longer package name it prefixes."""
+    pkg_re = re.compile(re.escape(pkg) + r"(?![\w])")
+    return "; ".join(line for line in err_lines if pkg_re.search(line))
+
+
+def _pids_of(name):
+    """Return the PIDs whose /proc/<pid>/comm matches name (Linux only)."""
+    pids = []
+    try:
+        entries = os.scandir("/proc")
+    except OSError:
+        return pids
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(os.path.join(entry.path, "comm")) as f:
+                    if f.read().strip() == name:
+                        pids.append(int(entry.name))
+            except OSError:
+                continue
+    return pids
+
+
+def _iter_rpms(root):
+    """Yield paths of *.rpm files under root using a single scandir pass per directory.
+
+    Directories are visited breadth-first, so a caller that only needs the
+    first match stops at the shallowest directory holding RPMs without
+    descending into the rest of the tree.
+    """
+    pending = [root]
+    while pending:
+        subdirs = []
+        for path in pending:
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".rpm") and entry.is_file(follow_symlinks=False):
+                        yield entry.path
+        pending = subdirs
+
+
 class BAClientHelper:
-    def __init__(self, module: AnsibleModule):
+    def __init__(self, module: "AnsibleModule"):
         self.module = module
+        # Probe results cached for the lifetime of the helper; reset whenever
+        # an install/uninstall changes what is on the host.
+        self._installed_cache = None
+        self._rpmdb_cache = None
+        self._prereq_cache = {}  # install_path -> verify_system_prereqs result
+        self._is_windows = IS_WINDOWS
+        self._arch = platform.machine()
 
     def run_cmd(self, cmd, use_unsafe_shell=False, check_rc=True):
         rc, out, err = self.module.run_command(cmd, use_unsafe_shell=use_unsafe_shell)
@@ -113,7 +289,7 @@ class BAClientHelper:
             return os.path.exists(path)
 
     def is_windows(self):
-        return platform.system().lower().startswith("win")
+        return self._is_windows
 
     def is_newer_version(self, target, current):
         try:
@@ -122,94 +298,153 @@ class BAClientHelper:
             return target != current
 
     def check_installed(self):
-        if self.is_windows():
-            try:
-                cmd = 'reg query "HKLM\\SOFTWARE\\IBM\\ADSM\\CurrentVersion\\Api64" /v PtfLevel'
-                rc, out, err = self.run_cmd(cmd, check_rc=False)
-                if rc == 0 and "PtfLevel" in out:
-                    version = out.split()[-1]
-                    return True, version
-                return False, None
-            except Exception as e:
-                return False, None
-        else:
-            cmd = "rpm -q TIVsm-BA"
+        """Return (installed, version), querying the package database at most once per state change."""
+        if self._installed_cache is None:
+            self._installed_cache = self._query_installed()
+        return self._installed_cache
+
+    def _invalidate_install_state(self):
+        """Forget cached package state after an operation that changes it."""
+        self._installed_cache = None
+        self._rpmdb_cache = None
+
+    def _rpm_db(self):
+        """Return {name: version-release} for all installed RPMs, read with one rpm -qa per state change."""
+        if self._rpmdb_cache is None:
+            cmd = ["rpm", "-qa", "--qf", "%{NAME}|%{VERSION}-%{RELEASE}\\n"]
             rc, out, err = self.run_cmd(cmd, check_rc=False)
-            if rc == 0 and "TIVsm-BA" in out:
-                rpm_full = out.strip().replace("TIVsm-BA-", "")
-                rpm_no_arch = rpm_full.split(".x86_64")[0]
-                version = rpm_no_arch.replace("-", ".")
+            if rc != 0:
+                self.module.fail_json(msg=f"Command failed: {' '.join(cmd)}\nError: {err.strip()}")
+            self._rpmdb_cache = dict(line.split("|", 1) for line in out.splitlines() if "|" in line)
+        return self._rpmdb_cache
+
+    def _tivsm_packages(self):
+        """Return installed TIVsm packages as NAME-VERSION-RELEASE lines, from the rpmdb snapshot."""
+        return "\n".join(
+            f"{name}-{version}" for name, version in sorted(self._rpm_db().items()) if name.startswith("TIVsm")
+        )
+
+    def _query_installed(self):
+        if self.is_windows():
+            version = _read_registry_value(r"SOFTWARE\IBM\ADSM\CurrentVersion\Api64", "PtfLevel")
+            if version:
                 return True, version
-            elif rc == 1:
-                return False, None
-            else:
-                self.module.fail_json(msg=f"Command failed: {cmd}\nError: {err.strip()}")
+            return False, None
+        else:
+            version = self._rpm_db().get("TIVsm-BA")
+            if version:
+                return True, version.replace("-", ".")
+            return False, None
 
-    def verify_system_prereqs(self):
+    def _has_install_privileges(self):
+        if self.is_windows():
+            # check admin membership of the current token in-process
+            import ctypes
+            try:
+                return bool(ctypes.windll.shell32.IsUserAnAdmin())
+            except (AttributeError, OSError):
+                rc, out, err = self.run_cmd('whoami /groups | find "Administrators"', use_unsafe_shell=True, check_rc=False)
+                return rc == 0
+        return os.geteuid() == 0
+
+    def _free_disk_mb(self, install_path):
+        # measured on the filesystem that will hold install_path; absolute so
+        # the walk up the parents always ends at a root, never at ""
+        check_path = os.path.abspath(install_path or "/")
+        while not os.path.exists(check_path) and os.path.dirname(check_path) != check_path:
+            check_path = os.path.dirname(check_path)
+        try:
+            if self.is_windows():
+                # free bytes available to the caller, straight from kernel32
+                import ctypes
+                free_bytes = ctypes.c_ulonglong(0)
+                if ctypes.windll.kernel32.GetDiskFreeSpaceExW(ctypes.c_wchar_p(check_path), ctypes.byref(free_bytes), None, None):
+                    return free_bytes.value >> 20
+                return shutil.disk_usage(check_path).free // (1024 * 1024)
+            st = os.statvfs(check_path)
+            return (st.f_bavail * st.f_frsize) >> 20
+        except OSError as e:
+            self.module.fail_json(msg=f"Unable to determine disk space for {check_path}: {e}")
+
+    def verify_system_prereqs(self, install_path="/"):
         """Verify system prerequisites (OS, architecture, privileges, disk, Java)"""
-        min_disk_mb = 1500
-        compatible_arch = ["x86_64", "AMD64"]
+        # the disk check depends on install_path, so results are kept per path
+        if install_path in self._prereq_cache:
+            return self._prereq_cache[install_path]
 
+        uname = platform.uname()
         sys_info = {
-            "os": platform.system(),
-            "arch": platform.machine(),
-            "hostname": platform.node(),
+            "os": uname.system,
+            "arch": self._arch,
+            "hostname": uname.node,
         }
 
         if self.is_windows():
-            # check admin membership
-            rc, out, err = self.run_cmd('whoami /groups | find "Administrators"', use_unsafe_shell=True, check_rc=False)
-            if rc != 0:
+            # The privilege probe may fall back to a whoami subprocess, so
+            # overlap it with the disk probe.
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                privileged_future = executor.submit(self._has_install_privileges)
+                free_mb_future = executor.submit(self._free_disk_mb, install_path)
+                privileged = privileged_future.result()
+                free_mb = free_mb_future.result()
+        else:
+            # geteuid and statvfs are in-process calls; a thread pool only adds overhead
+            privileged = self._has_install_privileges()
+            free_mb = self._free_disk_mb(install_path)
+
+        if not privileged:
+            if self.is_windows():
                 self.module.fail_json(
                     msg="Admin privileges required to install BA Client on Windows"
                 )
-        else:
-            if os.geteuid() != 0:
+            else:
                 self.module.fail_json(
                     msg="Root privileges required to install BA Client on Linux"
                 )
 
-        arch_compatible = sys_info["arch"] in compatible_arch
+        arch_compatible = sys_info["arch"] in COMPATIBLE_ARCH
         if not arch_compatible:
             self.module.fail_json(
                 msg=f"Incompatible architecture: {sys_info['arch']}. "
-                    f"Supported: {', '.join(compatible_arch)}"
+                    f"Supported: {', '.join(sorted(COMPATIBLE_ARCH))}"
             )
 
-        # disk usage
-        st = shutil.disk_usage("/")
-        free_mb = st.free // (1024 * 1024)
-        if free_mb < min_disk_mb:
+        if free_mb < MIN_DISK_MB:
             self.module.fail_json(
-                msg=f"Insufficient disk space. Required: {min_disk_mb} MB, Available: {free_mb} MB"
+                msg=f"Insufficient disk space. Required: {MIN_DISK_MB} MB, Available: {free_mb} MB"
             )
 
-        summary = (
-            f"System Compatibility Summary:\n"
-            f"- OS: {sys_info['os']}\n"
-            f"- Architecture: {sys_info['arch']} (compatible: {arch_compatible})\n"
-            f"- Free Disk Space: {free_mb} MB (required ≥ {min_disk_mb})\n"
-        )
+        checks_passed = arch_compatible and free_mb >= MIN_DISK_MB
 
-        self.module.log(summary)
+        # Only build and log the summary when it will be read: on failure or with -v
+        if not checks_passed or getattr(self.module, "_verbosity", 0) >= 1:
+            summary = (
+                f"System Compatibility Summary:\n"
+                f"- OS: {sys_info['os']}\n"
+                f"- Architecture: {sys_info['arch']} (compatible: {arch_compatible})\n"
+                f"- Free Disk Space: {free_mb} MB (required ≥ {MIN_DISK_MB})\n"
+            )
+            self.module.log(summary)
 
-        if not (arch_compatible and free_mb >= min_disk_mb):
-            self.module.fail_json(
-                msg=(
-                    "System compatibility checks failed. Ensure:\n"
-                    f" - Architecture: one of {compatible_arch}\n"
-                    f" - Disk space ≥ {min_disk_mb} MB\n"
-                    + summary
+            if not checks_passed:
+                self.module.fail_json(
+                    msg=(
+                        "System compatibility checks failed. Ensure:\n"
+                        f" - Architecture: one of {', '.join(sorted(COMPATIBLE_ARCH))}\n"
+                        f" - Disk space ≥ {MIN_DISK_MB} MB\n"
+                        + summary
+                    )
                 )
-            )
 
-        return {
+        result = self._prereq_cache[install_path] = {
             "status": "ok",
             "architecture": sys_info["arch"],
             "arch_compatible": arch_compatible,
-            "disk_space_ok": free_mb >= min_disk_mb,
+            "disk_space_ok": free_mb >= MIN_DISK_MB,
             "free_mb": free_mb,
         }
+        return result
 
     def extract_package(self, src, dest):
         """Extract tarball and ensure RPMs exist"""
@@ -229,21 +464,54 @@ class BAClientHelper:
         # Ensure destination directory exists
         os.makedirs(dest, exist_ok=True)
 
+        # --- Reuse a previous extraction of the same tarball ---
+        st = os.stat(src)
+        stamp = hashlib.sha256(f"{os.path.abspath(src)}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:16]
+        marker = os.path.join(dest, f".extracted_{stamp}")
+        if os.path.exists(marker):
+            first_rpm = next(_iter_rpms(dest), None)
+            if first_rpm is not None:
+                self.log(f"Reusing previous extraction of {src} in {dest}")
+                return os.path.dirname(first_rpm)
+
         # --- Extraction ---
-        cmd = f'tar -xf "{src}" -C "{dest}"'
-        rc, out, err = self.run_cmd(cmd, use_unsafe_shell=True)
-        if rc != 0:
-            self.module.fail_json(msg=f"Extraction failed: {err}")
+        # Stream the archive once, noting where the RPMs land as they are
+        # written, instead of running tar and walking the result afterwards.
+        import tarfile
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        rpm_dir = None
+        rpm_depth = None
+        try:
+            with tarfile.open(src, "r:*") as tf:
+                for member in tf:
+                    tf.extract(member, dest, **extract_kwargs)
+                    if member.isfile() and member.name.endswith(".rpm"):
+                        member_dir = os.path.dirname(os.path.normpath(member.name))
+                        depth = member_dir.count("/") if member_dir else -1
+                        if rpm_depth is None or depth < rpm_depth:
+                            rpm_dir, rpm_depth = os.path.join(dest, member_dir), depth
+        except (OSError, tarfile.TarError) as e:
+            self.module.fail_json(msg=f"Extraction failed: {e}")
+        open(marker, "w").close()
+
+        if rpm_dir is None:
+            self.module.fail_json(msg=f"No RPM packages found in extracted directory: {dest}")
 
-        # --- Find RPMs ---
-        rpm_files = []
-        for root, _, files in os.walk(dest):
-            rpm_files += [os.path.join(root, f) for f in files if f.endswith(".rpm")]
+        return os.path.normpath(rpm_dir)
 
-        if not rpm_files:
-            self.module.fail_json(msg=f"No RPM packages found in extracted directory: {dest}")
+    def _rpm_files(self, package_source, temp_dir):
+        """Return the RPMs to install from a tarball (extracted to temp_dir) or an RPM directory."""
+        if package_source.endswith(".tar") or package_source.endswith(".tar.gz"):
+            rpm_dir = self.extract_package(package_source, temp_dir)
+        elif os.path.isdir(package_source):
+            rpm_dir = package_source
+        else:
+            self.module.fail_json(msg=f"Invalid package source: {package_source}")
 
-        return os.path.dirname(rpm_files[0])
+        rpm_files = sorted(glob.iglob(os.path.join(glob.escape(rpm_dir), "*.rpm")))
+        if not rpm_files:
+            self.module.fail_json(msg=f"No RPM files found under {rpm_dir}")
+        return rpm_files
 
     def install_ba_client(self, package_source, install_path, temp_dir):
         """
@@ -257,30 +525,15 @@ class BAClientHelper:
             self.extract_package(package_source, temp_dir)
             # silent install typical pattern
             file_loc = os.path.dirname(package_source)
-            with open("testt.txt", "w") as tfr:
-                tfr.write("Installation started")
+            msi_path = os.path.join(file_loc, "baClient", "TSMClient", "IBM Storage Protect Client.msi")
 
-            cmd = f"\"{file_loc}/baClient/TSMClient/IBM Storage Protect Client.msi\" /qn INSTALLDIR=\"{install_path}\" /l*v install_baclient.log"
+            cmd = f"\"{msi_path}\" /qn INSTALLDIR=\"{install_path}\" /l*v install_baclient.log"
         else:
-            if package_source.endswith(".tar") or package_source.endswith(".tar.gz"):
-                self.extract_package(package_source, temp_dir)
-            else:
-                if os.path.isdir(package_source):
-                    temp_dir = package_source
-                else:
-                    self.module.fail_json(msg=f"Invalid package source: {package_source}")
+            # Plain -i: the -v/-h progress output was captured and decoded but never used
+            cmd = ["rpm", "-i", "--force", "--nodeps"] + self._rpm_files(package_source, temp_dir)
 
-            rpm_files = [
-                os.path.join(temp_dir, f)
-                for f in os.listdir(temp_dir)
-                if f.endswith(".rpm")
-            ]
-            if not rpm_files:
-                self.module.fail_json(msg=f"No RPM files found under {temp_dir}")
-
-            cmd = f'cd "{temp_dir}" && rpm -ivh --force --nodeps *.rpm'
-
-        rc, out, err = self.run_cmd(cmd, use_unsafe_shell=True)
+        rc, out, err = self.run_cmd(cmd, use_unsafe_shell=self.is_windows())
+        self._invalidate_install_state()
         if rc != 0:
             if (self.is_windows()):
                 print("Installation Failed")
@@ -293,11 +546,12 @@ class BAClientHelper:
         print("BA Client installation completed successfully")
         return True
     
-    def rollback(self, action="install", previous_version=None):
+    def rollback(self, action="install", previous_version=None, backup_dir=None):
         """
         Rollback mechanism for BA Client operations.
         - action='install' → uninstall packages
         - action='uninstall' → reinstall packages
+        - action='upgrade' → reinstall the packages upgrade_ba_client saved in backup_dir
         """
         self.module.warn(f"Initiating rollback for action={action}")
         print(f"Initiating rollback for action={action}")
@@ -305,13 +559,54 @@ class BAClientHelper:
         if self.is_windows():
             return self._rollback_windows(action, previous_version)
         else:
-            return self._rollback_linux(action)
+            return self._rollback_linux(action, backup_dir, previous_version)
         
+    def _reinstall_rpms(self, rpm_dir, reinstall_order):
+        """
+        Reinstall the RPMs for reinstall_order found in rpm_dir in a single rpm
+        transaction. Packages that are still installed are left out: rpm -i
+        would reject them and abort the whole transaction.
+        """
+        self._invalidate_install_state()
+        installed_pkgs = self._rpm_db()
+        rpm_files = {}
+        for pkg in reinstall_order:
+            if pkg in installed_pkgs:
+                continue
+            # IBM ships both NAME.<arch>.rpm and NAME-<version>.rpm; requiring
+            # '.' or '-' after NAME keeps TIVsm-BA from matching TIVsm-BAcit
+            pattern = os.path.join(glob.escape(rpm_dir), f"{glob.escape(pkg)}[-.]*.rpm")
+            rpm_files[pkg] = sorted(glob.iglob(pattern))
+
+        found = [path for paths in rpm_files.values() for path in paths]
+        rc, err_lines = None, []
+        if found:
+            cmd = ["rpm", "-i"] + found
+            self.module.log(f"Rollback command: {' '.join(cmd)}")
+            rc, out, err = self.run_cmd(cmd, check_rc=False)
+            err_lines = err.strip().splitlines()
+            self._invalidate_install_state()
+
+        results = []
+        for pkg in reinstall_order:
+            if pkg in installed_pkgs:
+                results.append({"package": pkg, "rc": None, "stderr": "", "status": "already installed"})
+            elif not rpm_files[pkg]:
+                results.append({"package": pkg, "rc": None, "stderr": f"No RPM found in {rpm_dir}"})
+            elif rc == 0:
+                results.append({"package": pkg, "rc": 0, "stderr": ""})
+            else:
+                # the transaction is all-or-nothing: report rpm's lines about
+                # this package, or that another package aborted it
+                reason = _rpm_errors_for(pkg, err_lines) or f"Not installed: rpm transaction failed with rc={rc}"
+                results.append({"package": pkg, "rc": rc, "stderr": reason})
+        return results
+
     # LINUX ROLLBACK
-    def _rollback_linux(self, action):
+    def _rollback_linux(self, action, backup_dir=None, previous_version=None):
         results = []
         package_dir = "/opt/baClient"  # default package repo
-        backup_dir = "/opt/baClientPackagesBk"
+        backup_dir = backup_dir or "/opt/baClientPackagesBk"
 
         # -------- INSTALL FAILURE --------
         if action == "install":
@@ -327,21 +622,26 @@ class BAClientHelper:
                 "gskcrypt64"
             ]
             self.module.log("Rollback: uninstalling packages from failed installation.")
-            for pkg in uninstall_order:
-                # Force uninstall without dependency checks and scripts
-                cmd = f"rpm -e --nodeps --noscripts {pkg}"
-                rc, out, err = self.run_cmd(cmd, check_rc=False)
-                results.append({
-                    "package": pkg,
-                    "rc": rc,
-                    "stdout": out.strip(),
-                    "stderr": err.strip()
-                })
+            self._invalidate_install_state()
+            installed_pkgs = self._rpm_db()
+            to_remove = [pkg for pkg in uninstall_order if pkg in installed_pkgs]
+            if to_remove:
+                # Force uninstall without dependency checks and scripts, all
+                # packages in one rpm transaction
+                rc, out, err = self.run_cmd(["rpm", "-e", "--nodeps", "--noscripts"] + to_remove, check_rc=False)
+                for pkg in to_remove:
+                    results.append({
+                        "package": pkg,
+                        "rc": rc,
+                        "stdout": out.strip(),
+                        "stderr": err.strip()
+                    })
                 if rc != 0:
-                    self.module.warn(f"Rollback warning: Failed to remove {pkg}, rc={rc}, err={err.strip()}")
+                    self.module.warn(f"Rollback warning: Failed to remove {', '.join(to_remove)}, rc={rc}, err={err.strip()}")
+            self._invalidate_install_state()
 
-            # Verify cleanup
-            rc, out, _ = self.run_cmd("rpm -qa 'TIVsm*'", check_rc=False)
+            # Verify cleanup; the fresh rpmdb snapshot is reused by later checks
+            out = self._tivsm_packages()
 
             if not out.strip():
                 self.module.warn("Rollback successful: All TIVsm packages removed.")
@@ -359,11 +659,7 @@ class BAClientHelper:
                 "TIVsm-BA", "TIVsm-BAcit", "TIVsm-BAhdw", "TIVsm-WEBGUI"
             ]
             self.module.log("Rollback: reinstalling packages due to failed uninstallation.")
-            for pkg in reinstall_order:
-                rpm_pattern = f"{package_dir}/{pkg}*.rpm"
-                cmd = f"rpm -ivh {rpm_pattern}"
-                rc, out, err = self.run_cmd(cmd, check_rc=False)
-                results.append({"package": pkg, "rc": rc, "stderr": err.strip()})
+            results.extend(self._reinstall_rpms(package_dir, reinstall_order))
             self.module.warn(f"Rollback successful: All packages reinstalled after uninstall failure.")
             return {"rollback_type": "uninstall", "results": results}
 
@@ -379,14 +675,38 @@ class BAClientHelper:
             # Restore configuration files
             for file in backup_files:
                 orig = file.replace(".bk", "")
-                if os.path.exists(file):
+                try:
                     shutil.copy(file, orig)
                     results.append({"file_restored": orig, "status": "restored"})
-                else:
+                except FileNotFoundError:
                     results.append({"file_restored": orig, "status": "backup_missing"})
 
+            # rpm -U is a single transaction: when it failed, the previous
+            # release is still installed and only the configs need restoring
+            self._invalidate_install_state()
+            _, current_version = self.check_installed()
+            if previous_version and current_version and compare_versions(current_version, previous_version) == 0:
+                shutil.rmtree(backup_dir, ignore_errors=True)
+                self.module.warn(f"Rollback: BA Client {previous_version} is still installed; configuration files restored.")
+                return {"rollback_type": "upgrade", "results": results}
+
             # First, remove the new upgrade version
-            self.run_cmd("rpm -e $(rpm -qa 'TIVsm*')", check_rc=False)
+            tivsm_pkgs = [name for name in self._rpm_db() if name.startswith("TIVsm")]
+            if tivsm_pkgs:
+                rc, _, err = self.run_cmd(["rpm", "-e"] + tivsm_pkgs, check_rc=False)
+                if rc != 0:
+                    self.module.warn(f"Rollback warning: Failed to remove {', '.join(tivsm_pkgs)}, rc={rc}, err={err.strip()}")
+
+            # Unpack the RPM archive written by upgrade_ba_client, if any
+            archive = os.path.join(backup_dir, RPM_BACKUP_ARCHIVE)
+            if os.path.exists(archive):
+                import tarfile
+                extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+                try:
+                    with tarfile.open(archive) as tf:
+                        tf.extractall(backup_dir, **extract_kwargs)
+                except (OSError, tarfile.TarError) as e:
+                    self.module.warn(f"Failed to unpack RPM backup {archive}: {e}")
 
             # Reinstall previous packages from backup
             reinstall_order = [
@@ -400,23 +720,19 @@ class BAClientHelper:
                 "TIVsm-WEBGUI"
             ]
 
-            for pkg in reinstall_order:
-                rpm_pattern = f"{backup_dir}/{pkg}*.rpm"
-                cmd = f"rpm -ivh {rpm_pattern}"
-                self.module.log(f"Rollback command: {cmd}")
-                rc, out, err = self.run_cmd(cmd, check_rc=False)
-                results.append({"package": pkg, "rc": rc, "stderr": err.strip()})
+            results.extend(self._reinstall_rpms(backup_dir, reinstall_order))
 
             # Cleanup
             if os.path.exists(backup_dir):
                 shutil.rmtree(backup_dir, ignore_errors=True)
                 results.append({"cleanup": backup_dir, "status": "removed"})
 
-            # Verify rollback success
-            rc, out, _ = self.run_cmd("rpm -qa 'TIVsm*'", check_rc=False)
-            if "8.1.25" in out:
+            # Verify rollback success against the version installed before the upgrade
+            _, restored_version = self.check_installed()
+            if previous_version and restored_version and compare_versions(restored_version, previous_version) == 0:
                 self.module.warn("Rollback successful: Previous version and configs restored after upgrade failure.")
             else:
+                out = self._tivsm_packages()
                 self.module.log(f"Rollback warning: restore may have failed — installed TIVsm packages:\n{out.strip()}")
 
             return {"rollback_type": "upgrade", "results": results}
@@ -433,14 +749,26 @@ class BAClientHelper:
                 "IBM Spectrum Protect Client",
                 "Tivoli Storage Manager Client"
             ]
-            for target in uninstall_targets:
-                ps_cmd = (
-                    f'Get-WmiObject -Class Win32_Product | '
-                    f'Where-Object {{ $_.Name -like "*{target}*" }} | '
-                    f'ForEach-Object {{ $_.Uninstall() }}'
-                )
-                rc, out, err = self.run_cmd(["powershell.exe", "-Command", ps_cmd], check_rc=False)
+            # One pass over the Uninstall registry key instead of a
+            # Win32_Product query per target; each match is removed with the
+            # uninstall command it registered.
+            matches = {target: [] for target in uninstall_targets}
+            for product_key, display_name, view in _iter_installed_products():
+                for target in uninstall_targets:
+                    if target in display_name:
+                        matches[target].append((product_key, view))
+            for target, product_keys in matches.items():
+                rc, err = 0, ""
+                for product_key, view in product_keys:
+                    cmd = _uninstall_command(product_key, view)
+                    if not cmd:
+                        rc, err = 1, f"No uninstall command registered for {product_key}"
+                        break
+                    rc, out, err = self.run_cmd(cmd, use_unsafe_shell=True, check_rc=False)
+                    if rc != 0:
+                        break
                 results.append({"package": target, "rc": rc, "stderr": err.strip()})
+            self._invalidate_install_state()
             return {"rollback_type": "install", "results": results}
 
         # ---------------- UNINSTALL FAILURE -----------------
@@ -468,10 +796,10 @@ class BAClientHelper:
             # Step 1: Restore config backups
             for file in config_files:
                 orig = file.replace(".bk", "")
-                if os.path.exists(file):
+                try:
                     shutil.copy(file, orig)
                     results.append({"file_restored": orig, "status": "restored"})
-                else:
+                except FileNotFoundError:
                     results.append({"file_restored": orig, "status": "backup_missing"})
 
             # Step 2: Reinstall previous version from backup
@@ -502,12 +830,11 @@ class BAClientHelper:
         """Verify that BA Client is installed correctly and return status summary."""
 
         if self.is_windows():
-            check_cmd = 'wmic product get name | find "IBM Storage Protect Client"'
-            print(check_cmd)
+            product = _find_installed_product("IBM Storage Protect Client")
+            rc, err = (0, "") if product else (1, "IBM Storage Protect Client not found in the Uninstall registry")
         else:
-            check_cmd = "rpm -q TIVsm-BA"
-
-        rc, out, err = self.run_cmd(check_cmd, use_unsafe_shell=self.is_windows(), check_rc=False)
+            installed, _ = self.check_installed()
+            rc, err = (0, "") if installed else (1, "package TIVsm-BA is not installed")
 
         if rc == 0:
             if self.is_windows():
@@ -531,52 +858,40 @@ class BAClientHelper:
             "ba_client_version": ba_client_version
         }
 
-    def configure_ba_client(self) -> None:
-        if self.is_windows():
-            config_dir = r"C:\Program Files\Tivoli\tsm\client\ba\bin"
-        else:
-            config_dir = "/opt/tivoli/tsm/client/ba/bin"
-        dsm_opt = f"{config_dir}/dsm.opt"
-        dsm_sys = f"{config_dir}/dsm.sys"
+    def _append_config(self, path, content):
+        """Append content to a dsm.* file, creating it if needed, with a single open."""
+        name = os.path.basename(path)
+        # append mode creates a missing file; the offset tells new from existing
+        with open(path, "a") as f:
+            if f.tell():
+                f.write("\n" + content)
+                self.module.warn(f"Updated existing {name} configuration.")
+            else:
+                f.write(content)
+                self.module.warn(f"Created default {name} configuration.")
 
-        # Ensure directory exists
-        os.makedirs(config_dir, exist_ok=True)
+    @functools.cached_property
+    def config_dir(self):
+        if self.is_windows():
+            return r"C:\Program Files\Tivoli\tsm\client\ba\bin"
+        return "/opt/tivoli/tsm/client/ba/bin"
 
-        # ----- DSM.SYS -----
-        sys_content = """SErvername  TSM_SERVER
-    TCPServeraddress  your.server.address
-    TCPPort           1500
-    """
+    @functools.cached_property
+    def dsm_opt_path(self):
+        return f"{self.config_dir}/dsm.opt"
 
-        if not os.path.exists(dsm_sys):
-            with open(dsm_sys, "w") as f:
-                f.write(sys_content)
-            self.module.warn("Created default dsm.sys configuration.")
-        else:
-            with open(dsm_sys, "a") as f:
-                f.write("\n" + sys_content)
-            self.module.warn("Updated existing dsm.sys configuration.")
-
-        # ----- DSM.OPT -----
-        opt_content = """SErvername  TSM_SERVER
-    NODename   your_node_name
-    PasswordDir /opt/tivoli/tsm/client/ba/bin
-    """
+    @functools.cached_property
+    def dsm_sys_path(self):
+        return f"{self.config_dir}/dsm.sys"
 
-        if not os.path.exists(dsm_opt):
-            with open(dsm_opt, "w") as f:
-                f.write(opt_content)
-            self.module.warn("Created default dsm.opt configuration.")
-        else:
-            with open(dsm_opt, "a") as f:
-                f.write("\n" + opt_content)
-            self.module.warn("Updated existing dsm.opt configuration.")
+    def configure_ba_client(self) -> None:
+        # Ensure directory exists
+        os.makedirs(self.config_dir, exist_ok=True)
 
-        # ----- Validation -----
-        if os.path.exists(dsm_opt) and os.path.exists(dsm_sys):
-            self.module.warn("BA Client configuration files created/updated successfully.")
-        else:
-            self.module.warn("BA Client configuration missing or not applied correctly.")
+        # append mode creates missing files, so both exist once these return
+        self._append_config(self.dsm_sys_path, DSM_SYS_DEFAULTS)
+        self._append_config(self.dsm_opt_path, DSM_OPT_DEFAULTS)
+        self.module.warn("BA Client configuration files created/updated successfully.")
 
     def start_baclient_daemon(self, ba_client_start_daemon):
         """Enable and start BA Client daemon/service across platforms."""
@@ -589,40 +904,43 @@ class BAClientHelper:
             # On Windows BA Client usually does not auto-create a service.
             # We should verify existence before starting.
 
+            # One PowerShell session finds the services, starts the stopped ones
+            # and reports Name|StatusBefore|StatusAfter for each.
             rc, out, err = self.run_cmd(
-                'powershell -Command "Get-Service | Where-Object {$_.Name -like \'*dsm*\' } | Select -ExpandProperty Name"',
+                'powershell -NoProfile -Command "Get-Service | Where-Object {$_.Name -like \'*dsm*\' } | '
+                'ForEach-Object { $before = $_.Status; if ($before -ne \'Running\') { '
+                'Start-Service -Name $_.Name -ErrorAction SilentlyContinue; $_.Refresh() }; '
+                '$_.Name + \'|\' + $before + \'|\' + $_.Status }"',
                 check_rc=False
             )
 
-            services = [s.strip() for s in out.splitlines() if s.strip()]
+            services = [line.strip().rsplit("|", 2) for line in out.splitlines() if line.count("|") >= 2]
 
             if not services:
                 self.module.warn("No BA Client Windows service found. Skipping daemon start.")
                 return {"daemon_enabled": False}
 
-            for svc in services:
-                rc_start, out_start, err_start = self.run_cmd(f'net start "{svc}"', check_rc=False)
-
-                if rc_start == 0:
+            for svc, before, after in services:
+                if before == "Running":
+                    self.module.warn(f"Windows service '{svc}' is already running.")
+                elif after == "Running":
                     self.module.warn(f"Windows service '{svc}' started successfully.")
                 else:
-                    self.module.warn(f"Failed to start Windows service '{svc}': {err_start.strip()}")
+                    self.module.warn(f"Failed to start Windows service '{svc}': status {after}")
 
             return {"daemon_enabled": True}
 
         else:
-            rc_enable, out_enable, err_enable = self.run_cmd("systemctl enable dsmcad.service", check_rc=False)
+            # enable --now enables and starts the unit in a single systemd call
+            rc_enable, out_enable, err_enable = self.run_cmd(["systemctl", "enable", "--now", "dsmcad.service"], check_rc=False)
             if rc_enable != 0:
-                self.module.warn(f"Failed to enable dsmcad.service: {err_enable.strip()}")
-
-            rc_start, out_start, err_start = self.run_cmd("systemctl start dsmcad.service", check_rc=False)
-            if rc_start != 0:
-                self.module.warn(f"Failed to start dsmcad.service: {err_start.strip()}")
-            else:
-                self.module.warn("dsmcad.service started successfully.")
+                # Nothing to verify if systemd already refused the unit
+                self.module.warn(f"Failed to enable/start dsmcad.service: {err_enable.strip()}")
+                return {"daemon_enabled": False}
+            self.module.warn("dsmcad.service started successfully.")
 
-            rc_status, out_status, err_status = self.run_cmd("systemctl is-enabled dsmcad.service", check_rc=False)
-            if rc_status == 0 and out_status.strip() == "enabled":
+            rc_status, out_status, err_status = self.run_cmd(["systemctl", "is-active", "dsmcad.service"], check_rc=False)
+            if rc_status == 0:
                 self.module.warn("dsmcad.service is enabled and active.")
                 daemon_enabled = True
             else:
@@ -631,34 +949,89 @@ class BAClientHelper:
 
             return {"daemon_enabled": daemon_enabled}
 
+    def _backup_config_files(self):
+        """Copy dsm.opt/dsm.sys to .bk for the upgrade rollback to restore."""
+        for f in ["/opt/tivoli/tsm/client/ba/bin/dsm.opt", "/opt/tivoli/tsm/client/ba/bin/dsm.sys"]:
+            try:
+                shutil.copy2(f, f"{f}.bk")
+            except FileNotFoundError:
+                pass
+
+    def _installed_rpm_files(self, rpm_paths):
+        """Return the rpm_paths whose NAME and VERSION-RELEASE are what the rpmdb has installed."""
+        if not rpm_paths:
+            return []
+        cmd = ["rpm", "-qp", "--qf", "%{NAME}|%{VERSION}-%{RELEASE}\\n"]
+        _, out, _ = self.run_cmd(cmd + rpm_paths, check_rc=False)
+        lines = out.splitlines()
+        if len(lines) != len(rpm_paths):
+            # an unreadable file prints no line, so the output no longer
+            # pairs up with rpm_paths; query those files one at a time
+            lines = [self.run_cmd(cmd + [path], check_rc=False)[1].strip() for path in rpm_paths]
+        installed_pkgs = self._rpm_db()
+        matches = []
+        for path, line in zip(rpm_paths, lines):
+            name, _, version = line.partition("|")
+            if version and installed_pkgs.get(name) == version:
+                matches.append(path)
+        return matches
+
+    def _backup_rpms(self, src_dir, backup_dir):
+        """Archive the installed release's RPMs under src_dir into backup_dir for _rollback_linux to reinstall."""
+        os.makedirs(backup_dir, exist_ok=True)
+        # Bundle the RPMs into one sequentially written archive rather than
+        # copying them file by file. Only files of the installed release are
+        # kept, not whatever else has been extracted to src_dir over time.
+        skip = os.path.join(backup_dir, "")
+        rpm_paths = self._installed_rpm_files([path for path in _iter_rpms(src_dir) if not path.startswith(skip)])
+        archive = os.path.join(backup_dir, RPM_BACKUP_ARCHIVE)
+        if not rpm_paths:
+            # never leave an earlier release's archive for the rollback to find
+            try:
+                os.remove(archive)
+            except FileNotFoundError:
+                pass
+        else:
+            import tarfile
+            try:
+                with tarfile.open(archive, "w") as tf:
+                    for rpm_path in rpm_paths:
+                        tf.add(rpm_path, arcname=os.path.basename(rpm_path))
+            except (OSError, tarfile.TarError) as e:
+                self.module.warn(f"Failed to back up RPMs from {src_dir}: {e}")
+
     def uninstall_ba_client(self, extract_dest="/opt/baClient", backup_dir="/opt/baClientPackagesBk"):
         """
         Performs complete uninstallation of BA Client and dependent packages with backup and rollback.
         """
         if self.is_windows():
-            cmd = 'powershell "Get-WmiObject -Class Win32_Product | Where-Object { $_.Name -like \'*IBM Storage Protect Client*\' } | ForEach-Object { $_.Uninstall() }"'
+            product = _find_installed_product("IBM Storage Protect Client")
+            if not product:
+                self.log("BA Client is not installed on this system. Skipping uninstallation.")
+                return False
+            cmd = _uninstall_command(product[0], product[2])
+            if not cmd:
+                self.module.fail_json(msg=f"Uninstallation failed: no uninstall command registered for {product[1]}")
             rc, out, err = self.run_cmd(cmd, use_unsafe_shell=True, check_rc=False)
+            self._invalidate_install_state()
             if rc != 0:
                 self.module.fail_json(msg=f"Uninstallation failed: {err}")
             return True
 
-        rc, out, err = self.run_cmd("rpm -q TIVsm-BA", check_rc=False)
-        if rc != 0:
+        installed, _ = self.check_installed()
+        if not installed:
             self.log("BA Client is not installed on this system. Skipping uninstallation.")
             return False
 
-        self.run_cmd("systemctl stop dsmcad", check_rc=False)
-        self.run_cmd("killall dsmc", check_rc=False)
-
-        os.makedirs(backup_dir, exist_ok=True)
-        for f in ["/opt/tivoli/tsm/client/ba/bin/dsm.opt", "/opt/tivoli/tsm/client/ba/bin/dsm.sys"]:
-            if os.path.exists(f):
-                shutil.copy2(f, f"{f}.bk")
+        self.run_cmd(["systemctl", "stop", "dsmcad"], check_rc=False)
+        for pid in _pids_of("dsmc"):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
 
-        rc, out, err = self.run_cmd(f"find {extract_dest} -name '*.rpm'", check_rc=False)
-        if out.strip():
-            for rpm_path in out.strip().splitlines():
-                self.run_cmd(f"cp {rpm_path} {backup_dir}", check_rc=False)
+        self._backup_config_files()
+        self._backup_rpms(extract_dest, backup_dir)
 
         uninstall_order = [
             "TIVsm-BAcit",
@@ -672,24 +1045,28 @@ class BAClientHelper:
             "gskcrypt64"
         ]
 
-        successfully_uninstalled = []
-        failed_packages = []
+        successfully_uninstalled = set()
+        failed_packages = {}
 
-        for pkg in uninstall_order:
-            rc, _, err = self.run_cmd(f"rpm -q {pkg}", check_rc=False)
-            if rc != 0:
-                continue
+        installed_pkgs = self._rpm_db()
+        to_remove = [pkg for pkg in uninstall_order if pkg in installed_pkgs]
 
-            rc, out, err = self.run_cmd(f"rpm -e {pkg}", check_rc=False)
+        # A single rpm transaction removes the whole set and resolves the
+        # dependency order between the packages itself.
+        if to_remove:
+            rc, out, err = self.run_cmd(["rpm", "-e"] + to_remove, check_rc=False)
             if rc == 0:
-                successfully_uninstalled.append(pkg)
+                successfully_uninstalled.update(to_remove)
             else:
-                failed_packages.append((pkg, err))
+                err_lines = err.strip().splitlines()
+                for pkg in to_remove:
+                    failed_packages[pkg] = _rpm_errors_for(pkg, err_lines) or err.strip()
+        self._invalidate_install_state()
 
         if failed_packages:
             self.module.fail_json(
-                msg=f"Uninstallation failed for packages: {', '.join([p for p, _ in failed_packages])}. "
-                    f"Reason(s): {'; '.join([e for _, e in failed_packages])}."
+                msg=f"Uninstallation failed for packages: {', '.join(failed_packages)}. "
+                    f"Reason(s): {'; '.join(f'{pkg}: {reason}' for pkg, reason in failed_packages.items())}."
             )
 
         shutil.rmtree(backup_dir, ignore_errors=True)
@@ -702,34 +1079,38 @@ class BAClientHelper:
         if not installed:
             self.module.fail_json(msg="BA Client not installed. Please install instead of upgrade.")
 
-        self.log(f"Upgrading BA Client from {installed_version} -> {ba_client_version}")
-
-        backup_dir = os.path.join(temp_dir, "backup_old_rpms")
-        os.makedirs(backup_dir, exist_ok=True)
-
-        # Backup currently installed BA Client rpms
-        cmd = "rpm -qa 'TIVsm*' --queryformat '%{NAME}-%{VERSION}-%{RELEASE}.%{ARCH}\n'"
-        rc, out, err = self.run_cmd(cmd, check_rc=False)
-
-        for pkg in out.strip().splitlines():
-            rpm_path = f"/var/lib/rpm/{pkg}.rpm"
-            # In real systems, we may not have the original rpm, so use `rpm -q --qf` to find installed details
-            # Best approach: use repoquery or keep old rpms in a known directory
-            self.run_cmd(f"rpm -qp --qf '%{{NAME}}' {pkg}", check_rc=False)
-            # Simulate backup: copy old rpm from your package source path if available
-            self.run_cmd(f"cp {package_source}/{pkg}*.rpm {backup_dir}/", check_rc=False)
+        # Uninstall + reinstall takes minutes; skip it when there is nothing to do
+        if compare_versions(ba_client_version, installed_version) == 0:
+            return {"changed": False, "msg": f"BA Client is already at version {ba_client_version}"}
 
-        self.module.log(f"Backed up existing rpms to {backup_dir}")
+        self.log(f"Upgrading BA Client from {installed_version} -> {ba_client_version}")
 
-        self.uninstall_ba_client()
+        if self.is_windows():
+            self.uninstall_ba_client()
+            self._invalidate_install_state()
+            self.install_ba_client(package_source, install_path, temp_dir)
+        else:
+            # rpm -U replaces the old packages in one transaction, so no
+            # separate uninstall pass is needed. Take the backups that pass
+            # used to write: the config files, and the previous release's
+            # RPMs before the new package is extracted over them.
+            backup_dir = os.path.join(temp_dir, UPGRADE_BACKUP_DIR)
+            self._backup_config_files()
+            self._backup_rpms(temp_dir, backup_dir)
+            self.module.log(f"Backed up existing rpms to {backup_dir}")
+            rpm_files = self._rpm_files(package_source, temp_dir)
+            self.run_cmd(["systemctl", "stop", "dsmcad"], check_rc=False)
+            rc, out, err = self.run_cmd(["rpm", "-U", "--force", "--nodeps"] + rpm_files, check_rc=False)
+            self._invalidate_install_state()
+            if rc != 0:
+                self.module.fail_json(msg=f"Upgrade failed: {err}")
 
-        self.install_ba_client(package_source, install_path, temp_dir)
         self.configure_ba_client()
         self.post_installation_verification(ba_client_version, state)
         self.start_baclient_daemon(ba_client_start_daemon=True)
 
         post_installed, post_version = self.check_installed()
-        if not post_installed or post_version != ba_client_version:
+        if not post_installed or compare_versions(post_version, ba_client_version) != 0:
             if (IS_WINDOWS):
                 print("Upgrade failed: version mismatch after installation")
             else:
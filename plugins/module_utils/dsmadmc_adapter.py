@@ -3,8 +3,12 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from ansible.module_utils.basic import AnsibleModule, env_fallback
+import shlex
 import subprocess
 
+# Actions that are a no-op when the object does not exist
+REMOVE_ACTIONS = frozenset(('remove', 'delete'))
+
 
 class DsmadmcAdapter(AnsibleModule):
     url = None
@@ -51,7 +55,9 @@ class DsmadmcAdapter(AnsibleModule):
         )
         self.json_output['command'] = command
         try:
-            result = subprocess.run(command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # Split like /bin/sh would, but exec dsmadmc directly: no shell
+            # process, and '*' or '$' in object names/passwords are not expanded
+            result = subprocess.run(shlex.split(command), check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             if auto_exit and result.returncode == 10:
                 self.json_output['changed'] = False
                 self.exit_json(**self.json_output)
@@ -67,6 +73,16 @@ class DsmadmcAdapter(AnsibleModule):
             if exit_on_fail and e.returncode != 10:
                 self.fail_json(msg=e.stdout.decode('utf-8'), rc=e.returncode, **self.json_output)
             return e.returncode, e.stdout.decode('utf-8'), e
+        except ValueError as e:
+            # unbalanced quotes; the shell used to reject these with rc 2
+            if exit_on_fail:
+                self.fail_json(msg=f'Unable to parse dsmadmc command: {e}', rc=2, **self.json_output)
+            return 2, '', e
+        except OSError as e:
+            # dsmadmc not found / not executable; the shell used to report this as rc 127
+            if exit_on_fail:
+                self.fail_json(msg=f'Unable to run dsmadmc: {e}', rc=127, **self.json_output)
+            return 127, '', e
 
     def find_one(self, object_type, name, fail_on_not_found=False):
         command = f"-comma q {object_type} {name} format=detailed"
@@ -78,7 +94,7 @@ class DsmadmcAdapter(AnsibleModule):
         return rc == 0, out
 
     def perform_action(self, action, object_type, object_identifier, options='', exists=False, existing=None, auto_exit=True):
-        if not exists and action in ['remove', 'delete']:
+        if not exists and action in REMOVE_ACTIONS:
             if auto_exit:
                 self.exit_json(**self.json_output)
             return 0
@@ -87,7 +103,7 @@ class DsmadmcAdapter(AnsibleModule):
         if exists or rc == 10:
             # Check if idempotent
             _, new_object = self.find_one(object_type, object_identifier)
-            self.json_output['changed'] = self.json_output['changed'] or existing and existing != new_object or exists and action in ['remove', 'delete']
+            self.json_output['changed'] = self.json_output['changed'] or existing and existing != new_object or exists and action in REMOVE_ACTIONS
             if auto_exit:
                 self.exit_json(**self.json_output)
             return rc
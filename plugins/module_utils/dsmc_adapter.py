@@ -42,23 +42,33 @@ class DsmcAdapter(AnsibleModule):
         for param, _ in list(DsmcAdapter.AUTH_ARGSPEC.items()):
             setattr(self, param, self.params.get(param))
 
-    def run_command(self, command):
-        command = f'dsmc {command} -se={self.server_name} -virtualnode={self.node_name} -pass={self.password} '
-        self.json_output['command'] = command
+    def run_command(self, args):
+        # args is the dsmc argument list; it is exec'd as is, never re-parsed
+        # from a formatted string, so quotes or spaces in values are harmless
+        argv = ['dsmc', *args, f'-se={self.server_name}', f'-virtualnode={self.node_name}']
+        self.json_output['command'] = ' '.join(argv + ['-pass=********'])
+        argv.append(f'-pass={self.password}')
         try:
-            result = subprocess.run(command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            self.json_output['changed'] = True
-            self.json_output['output'] = result.stdout.decode('utf-8')
-            self.exit_json(**self.json_output)
-            return result.returncode, result.stdout.decode('utf-8'), None
-        except subprocess.CalledProcessError as e:
+            result = subprocess.run(argv, check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            self.json_output['changed'] = False
+            self.fail_json(msg=f'Unable to run dsmc: {e}', rc=127, **self.json_output)
+            return 127, '', e
+
+        # decode each stream once and reuse it for the result and the return value
+        stdout = result.stdout.decode('utf-8')
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8')
             self.json_output['changed'] = False
-            self.fail_json(msg=e.stdout.decode('utf-8') + e.stderr.decode('utf-8'), rc=e.returncode, **self.json_output)
-            return e.returncode, e.stdout.decode('utf-8'), e
+            self.fail_json(msg=stdout + stderr, rc=result.returncode, **self.json_output)
+            return result.returncode, stdout, stderr
+        self.json_output['changed'] = True
+        self.json_output['output'] = stdout
+        self.exit_json(**self.json_output)
+        return result.returncode, stdout, None
 
-    def perform_action(self, action, object, options=''):
-        command = f"{action} {object} {options}"
-        rc, output, error = self.run_command(command)
+    def perform_action(self, action, objects, options=()):
+        rc, output, error = self.run_command([action, *objects, *options])
         if rc == 0:
             self.json_output['changed'] = True
         self.exit_json(**self.json_output)
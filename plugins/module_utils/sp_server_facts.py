@@ -1,3 +1,4 @@
+import shlex
 import subprocess
 
 from ..module_utils.dsmadmc_adapter import DsmadmcAdapter
@@ -18,7 +19,8 @@ class DsmadmcAdapterExtended(DsmadmcAdapter):
 
         self.json_output['command'] = command
         try:
-            result = subprocess.run(command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # exec dsmadmc directly, as in DsmadmcAdapter.run_command
+            result = subprocess.run(shlex.split(command), check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             raw_output = result.stdout.decode('utf-8')
             self.json_output['output'] = raw_output
 
@@ -30,6 +32,51 @@ class DsmadmcAdapterExtended(DsmadmcAdapter):
             if exit_on_fail:
                 self.fail_json(msg=e.stderr.decode('utf-8'), rc=e.returncode, **self.json_output)
             return e.returncode, None, e.stderr.decode('utf-8')
+        except ValueError as e:
+            if exit_on_fail:
+                self.fail_json(msg=f'Unable to parse dsmadmc command: {e}', rc=2, **self.json_output)
+            return 2, None, str(e)
+        except OSError as e:
+            if exit_on_fail:
+                self.fail_json(msg=f'Unable to run dsmadmc: {e}', rc=127, **self.json_output)
+            return 127, None, str(e)
+
+
+# Field order of the comma-delimited 'q status' / 'q monitorsettings' output
+_Q_STATUS_LABELS = (
+    "Monitor Status", "Status Refresh Interval (Minutes)", "Status Retention (Hours)",
+    "Monitor Message Alerts", "Alert Update Interval (Minutes)", "Alert to Email",
+    "Send Alert Summary to Administrators", "Alert from Email Address", "Alert SMTP Host",
+    "Alert SMTP Port", "Alert Active Duration (Minutes)", "Alert Inactive Duration (Minutes)",
+    "Alert Closed Duration (Minutes)", "Monitoring Admin", "Monitored Group", "Monitored Servers",
+    "At-Risk Interval for Applications", "Skipped files as At-Risk for Applications?",
+    "At-Risk Interval for Virtual Machines", "Skipped files as At-Risk for Virtual Machines?",
+    "At-Risk Interval for Systems", "Skipped files as At-Risk for Systems?"
+)
+
+
+# Column order of the comma-delimited rows parsed below
+_COPYGROUP_KEYS = (
+    "Policy Domain Name", "Policy Set Name", "Mgmt Class Name", "Copy Group Name",
+    "Versions Data Exists", "Versions Data Deleted", "Retain Extra Versions", "Retain Only Version"
+)
+_REPLRULE_KEYS = (
+    "Replication Rule Name", "Target Replication Server", "Active Only", "Enabled"
+)
+_DEVCLASS_KEYS = (
+    "Device Class Name", "Device Access Strategy", "Storage Pool Count",
+    "Device Type", "Format", "Est/Max Capacity (MB)", "Mount Limit"
+)
+_MGMTCLASS_KEYS = (
+    "Policy Domain Name", "Policy Set Name", "Mgmt Class Name", "Default Mgmt Class?", "Description"
+)
+_STGPOOL_KEYS = (
+    "Storage Pool Name", "Device Class Name", "Storage Type", "Estimated Capacity", "Pct Util",
+    "Pct Migr", "High Mig Pct", "Low Mig Pct", "Next Storage Pool"
+)
+
+# Deletes double quotes from a whole line in one pass
+_STRIP_QUOTES = str.maketrans('', '', '"')
 
 
 class DSMParser:
@@ -48,21 +95,7 @@ class DSMParser:
         Returns:
             dict: A dictionary with parsed key-value pairs based on the 'q status' output.
         """
-        labels = [
-            "Monitor Status", "Status Refresh Interval (Minutes)", "Status Retention (Hours)",
-            "Monitor Message Alerts", "Alert Update Interval (Minutes)", "Alert to Email",
-            "Send Alert Summary to Administrators", "Alert from Email Address", "Alert SMTP Host",
-            "Alert SMTP Port", "Alert Active Duration (Minutes)", "Alert Inactive Duration (Minutes)",
-            "Alert Closed Duration (Minutes)", "Monitoring Admin", "Monitored Group", "Monitored Servers",
-            "At-Risk Interval for Applications", "Skipped files as At-Risk for Applications?",
-            "At-Risk Interval for Virtual Machines", "Skipped files as At-Risk for Virtual Machines?",
-            "At-Risk Interval for Systems", "Skipped files as At-Risk for Systems?"
-        ]
-
-        values = dsm_output.split(',')
-        parsed_data = dict(zip(labels, values))
-
-        return parsed_data
+        return dict(zip(_Q_STATUS_LABELS, dsm_output.split(',')))
 
     @staticmethod
     def parse_q_monitorsettings(dsm_output):
@@ -75,21 +108,7 @@ class DSMParser:
         Returns:
             dict: A dictionary with parsed key-value pairs based on the 'q monitorsettings' output.
         """
-        labels = [
-            "Monitor Status", "Status Refresh Interval (Minutes)", "Status Retention (Hours)",
-            "Monitor Message Alerts", "Alert Update Interval (Minutes)", "Alert to Email",
-            "Send Alert Summary to Administrators", "Alert from Email Address", "Alert SMTP Host",
-            "Alert SMTP Port", "Alert Active Duration (Minutes)", "Alert Inactive Duration (Minutes)",
-            "Alert Closed Duration (Minutes)", "Monitoring Admin", "Monitored Group", "Monitored Servers",
-            "At-Risk Interval for Applications", "Skipped files as At-Risk for Applications?",
-            "At-Risk Interval for Virtual Machines", "Skipped files as At-Risk for Virtual Machines?",
-            "At-Risk Interval for Systems", "Skipped files as At-Risk for Systems?"
-        ]
-
-        values = dsm_output.split(',')
-        parsed_data = dict(zip(labels, values))
-
-        return parsed_data
+        return dict(zip(_Q_STATUS_LABELS, dsm_output.split(',')))
 
     @staticmethod
     def parse_q_db(raw_output):
@@ -102,8 +121,8 @@ class DSMParser:
         Returns:
             dict: A dictionary with parsed database information (e.g., name, pages, usage).
         """
-        raw_data = raw_output.splitlines()[0]
-        parsed_data = [item.strip().replace('"', '') for item in raw_data.split(",")]
+        raw_data = raw_output.splitlines()[0].translate(_STRIP_QUOTES)
+        parsed_data = [item.strip() for item in raw_data.split(",")]
 
         parsed_output = {
             "Database Name": parsed_data[0],
@@ -126,7 +145,7 @@ class DSMParser:
         Returns:
             dict: A dictionary with parsed space information (total, used, and free space).
         """
-        parsed_values = [item.strip().replace('"', '') for item in raw_output.strip().split(",")]
+        parsed_values = [item.strip() for item in raw_output.strip().translate(_STRIP_QUOTES).split(",")]
         parsed_output = {
             "Total Space (MB)": parsed_values[0],
             "Used Space (MB)": parsed_values[1],
@@ -145,7 +164,7 @@ class DSMParser:
         Returns:
             dict: A dictionary with parsed space information (total, used, and free space).
         """
-        parsed_values = [item.strip().replace('"', '') for item in raw_output.strip().split(",")]
+        parsed_values = [item.strip() for item in raw_output.strip().translate(_STRIP_QUOTES).split(",")]
         parsed_output = {
             "Total Space (MB)": parsed_values[0],
             "Used Space (MB)": parsed_values[1],
@@ -188,15 +207,10 @@ class DSMParser:
             list: A list of dictionaries, each containing parsed policy setting details.
         """
         rows = raw_output.strip().split("\n")
-        keys = [
-            "Policy Domain Name", "Policy Set Name", "Mgmt Class Name", "Copy Group Name",
-            "Versions Data Exists", "Versions Data Deleted", "Retain Extra Versions", "Retain Only Version"
-        ]
 
         parsed_output = []
         for row in rows:
-            values = [value.strip() for value in row.split(",")]
-            parsed_output.append(dict(zip(keys, values)))
+            parsed_output.append({key: value.strip() for key, value in zip(_COPYGROUP_KEYS, row.split(","))})
 
         return parsed_output
 
@@ -212,16 +226,13 @@ class DSMParser:
             dict: A dictionary with parsed replication rules and a footer message.
         """
         rows = raw_output.strip().split("\n")
-        keys = [
-            "Replication Rule Name", "Target Replication Server", "Active Only", "Enabled"
-        ]
         parsed_output = []
 
         for row in rows:
             if row.startswith("ANR1999I"):
                 continue
-            values = [value.strip() if value else None for value in row.split(",")]
-            parsed_output.append(dict(zip(keys, values)))
+            parsed_output.append({key: value.strip() if value else None
+                                  for key, value in zip(_REPLRULE_KEYS, row.split(","))})
 
         footer_message = "ANR1999I QUERY REPLRULE completed successfully."
         return {"rules": parsed_output, "footer_message": footer_message}
@@ -237,13 +248,8 @@ class DSMParser:
         Returns:
             dict: A dictionary with parsed device class details.
         """
-        keys = [
-            "Device Class Name", "Device Access Strategy", "Storage Pool Count",
-            "Device Type", "Format", "Est/Max Capacity (MB)", "Mount Limit"
-        ]
-
-        values = [value.strip() if value else None for value in raw_output.strip().split(",")]
-        parsed_output = dict(zip(keys, values))
+        parsed_output = {key: value.strip() if value else None
+                         for key, value in zip(_DEVCLASS_KEYS, raw_output.strip().split(","))}
 
         return parsed_output
 
@@ -258,15 +264,11 @@ class DSMParser:
         Returns:
             list: A list of dictionaries with parsed policy management class details.
         """
-        keys = [
-            "Policy Domain Name", "Policy Set Name", "Mgmt Class Name", "Default Mgmt Class?", "Description"
-        ]
         rows = [line.strip() for line in raw_output.strip().split("\n") if line.strip()]
 
         parsed_output = []
         for row in rows:
-            values = [value.strip() for value in row.split(",")]
-            parsed_output.append(dict(zip(keys, values)))
+            parsed_output.append({key: value.strip() for key, value in zip(_MGMTCLASS_KEYS, row.split(","))})
         return parsed_output
 
     @staticmethod
@@ -280,17 +282,11 @@ class DSMParser:
         Returns:
             list: A list of dictionaries with parsed storage pool details.
         """
-        keys = [
-            "Storage Pool Name", "Device Class Name", "Storage Type", "Estimated Capacity", "Pct Util",
-            "Pct Migr", "High Mig Pct", "Low Mig Pct", "Next Storage Pool"
-        ]
-
         rows = [line.strip() for line in raw_output.strip().split("\n") if line.strip()]
         parsed_output = []
 
         for row in rows:
-            values = [value.strip() for value in row.split(",")]
-            parsed_output.append(dict(zip(keys, values)))
+            parsed_output.append({key: value.strip() for key, value in zip(_STGPOOL_KEYS, row.split(","))})
 
         return parsed_output
 
@@ -355,12 +351,15 @@ class SpServerResponseMapper:
     @staticmethod
     def map_to_developer_friendly(json_data):
 
+        rename = SpServerResponseMapper.mapping.get
+        remap = SpServerResponseMapper.map_to_developer_friendly
+
         if isinstance(json_data, dict):
-            # Recursively map each key-value pair in the dictionary
-            return {SpServerResponseMapper.mapping.get(key, key): SpServerResponseMapper.map_to_developer_friendly(value)
+            # Map each key; only nested containers need another pass, scalars pass through
+            return {rename(key, key): remap(value) if isinstance(value, (dict, list)) else value
                     for key, value in json_data.items()}
         elif isinstance(json_data, list):
-            # Recursively map each item in the list
-            return [SpServerResponseMapper.map_to_developer_friendly(item) for item in json_data]
+            # Recursively map each container item in the list
+            return [remap(item) if isinstance(item, (dict, list)) else item for item in json_data]
         else:
             return json_data
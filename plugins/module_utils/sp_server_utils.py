@@ -18,6 +18,7 @@ Naming convention: <area>_<action>
   ba_*        : BA Server tiny utilities (paths/version)
 """
 
+import functools
 import os
 import re
 import sys
@@ -71,6 +72,10 @@ def _error(context, msg, *args):
 # OS helpers
 # -----------------------------
 
+# distro id -> normalized osname
+_LINUX_OSNAME = dict.fromkeys(("rhel", "centos", "rocky", "almalinux", "oraclelinux"), "rhel")
+
+
 def os_oskey(context: Dict[str, Any]) -> Dict[str, str]:
     os_data = context.get("os", {}) or {}
     family = (os_data.get("family") or "").lower()
@@ -89,11 +94,7 @@ def os_oskey(context: Dict[str, Any]) -> Dict[str, str]:
     # Determine distro / specific OS name
     if os_family == "linux":
         # Normalize common RHEL-family distros under "rhel"
-        rhel_like = {"rhel", "centos", "rocky", "almalinux", "oraclelinux"}
-        if distro_id in rhel_like:
-            os_name = "rhel"
-        else:
-            os_name = distro_id or "linux"
+        os_name = _LINUX_OSNAME.get(distro_id) or distro_id or "linux"
     else:
         # For non-Linux OS, prefer reported id; fallback to family
         os_name = distro_id or os_family
@@ -108,10 +109,9 @@ def _read_linux_os_release() -> Dict[str, str]:
     try:
         with open(path, "r", encoding="utf-8") as f:
             for line in f:
-                line = line.strip()
-                if not line or line.startswith("#") or "=" not in line:
+                k, sep, v = line.strip().partition("=")
+                if not sep or k.startswith("#"):
                     continue
-                k, v = line.split("=", 1)
                 data[k] = v.strip().strip('"')
     except Exception:
         pass
@@ -119,6 +119,12 @@ def _read_linux_os_release() -> Dict[str, str]:
 
 
 def get_os_info() -> Dict[str, Any]:
+    # OS identity can't change within a run; callers get their own copy
+    return dict(_os_info())
+
+
+@functools.lru_cache(maxsize=None)
+def _os_info() -> Dict[str, Any]:
     sysname = platform.system() or "Unknown"
     info: Dict[str, Any] = {"family": sysname}
 
@@ -1043,17 +1049,14 @@ def find_installer(
             "data": {"installerfile": None, "other_files": []},
         }
 
-    # Gather candidates
+    # Gather candidates in one scandir pass (DirEntry.is_file avoids a stat per entry)
+    ext_cmp = ext.lower() if case_insensitive else ext
     candidates = []
-    for entry in base_path.iterdir():
-        if not entry.is_file():
-            continue
-        if case_insensitive:
-            if entry.suffix.lower() == ext.lower():
-                candidates.append(entry)
-        else:
-            if entry.suffix == ext:
-                candidates.append(entry)
+    with os.scandir(base_path) as entries:
+        for entry in entries:
+            suffix = os.path.splitext(entry.name)[1]
+            if (suffix.lower() if case_insensitive else suffix) == ext_cmp and entry.is_file():
+                candidates.append(Path(entry.path))
 
     if not candidates:
         return {
@@ -1127,6 +1130,11 @@ def find_installer(
         },
     }
 
+
+# Fallback version finder for artifact patterns without a capture group
+_VERSION_FINDER_RE = re.compile(r"(\d+(?:[._-]\d+)*)", re.IGNORECASE)
+
+
 def artifacts_find_best_old(
     oskey: str,
     base_dir: str | Path,
@@ -1155,9 +1163,6 @@ def artifacts_find_best_old(
         flags = re.IGNORECASE if case_insensitive else 0
         pat = re.compile(expr, flags)
 
-    # Fallback version finder if the main pattern has no capture group
-    version_finder = re.compile(r"(\d+(?:[._-]\d+)*)", re.IGNORECASE)
-
     files = base.rglob("*") if recursive else base.iterdir()
     matches: list[tuple[Path, str]] = []
 
@@ -1179,7 +1184,7 @@ def artifacts_find_best_old(
 
         if not ver:
             # Fallback: try to infer version from filename
-            fm = version_finder.search(p.stem)
+            fm = _VERSION_FINDER_RE.search(p.stem)
             ver = fm.group(1) if fm else p.stem  # last resort: whole stem
 
         matches.append((p, str(ver)))
@@ -142,6 +142,24 @@ results:
               backup_end: "2024-01-15 11:45:00"
 '''
 
+# (query, dsmc arguments, parser), in reporting order. version is read from
+# the 'query session' banner, so it shares that command with session.
+QUERIES = tuple(
+    (query, command, getattr(DSMCParser, f'parse_q_{query}'))
+    for query, command in (
+        ('version', ('query', 'session')),
+        ('session', ('query', 'session')),
+        ('schedule', ('query', 'schedule')),
+        ('filespace', ('query', 'filespace')),
+        ('backup', ('query', 'backup')),
+        ('archive', ('query', 'archive')),
+        ('inclexcl', ('query', 'inclexcl')),
+        ('systeminfo', ('query', 'systeminfo')),
+        ('options', ('query', 'options')),
+    )
+)
+
+
 def build_windows_like_module():
     """
     Create a minimal Ansible-like module for Windows / no-ansible environments.
@@ -250,18 +268,6 @@ def main():
 
     results = {}
 
-    queries = [
-        'version',
-        'session',
-        'schedule',
-        'filespace',
-        'backup',
-        'archive',
-        'inclexcl',
-        'systeminfo',
-        'options'
-    ]
-
     # For Windows shim, we need to handle DSMC commands differently
     if not HAS_ANSIBLE or platform.system().lower() == "windows":
         # Windows standalone mode - execute DSMC commands directly
@@ -281,33 +287,28 @@ def main():
             exe_path = os.path.join(path, "dsmc.exe")
             if os.path.exists(exe_path):
                 dsmc_dir = path
-                dsmc_exe = "dsmc.exe"  # Use relative name since we'll change directory
+                dsmc_exe = exe_path  # full path: CreateProcess does not search cwd
                 break
         
         if not dsmc_dir:
             module.fail_json(msg="Could not find dsmc.exe. Please ensure IBM Storage Protect BA Client is installed.")
         
-        for query in queries:
+        outputs = {}
+        for query, command, parse in QUERIES:
             if module.params.get(f'q_{query}'):
-                # Build DSMC command - simple commands without parameters
-                # DSMC reads configuration from dsm.opt and uses password file
-                if query == 'version':
-                    cmd = f'{dsmc_exe} query session'
-                elif query == 'session':
-                    cmd = f'{dsmc_exe} query session'
-                elif query == 'systeminfo':
-                    cmd = f'{dsmc_exe} query systeminfo'
-                elif query == 'options':
-                    cmd = f'{dsmc_exe} query options'
-                else:
-                    cmd = f'{dsmc_exe} query {query}'
+                # Simple commands without parameters: DSMC reads configuration
+                # from dsm.opt and uses the password file
+                cmd = (dsmc_exe,) + command
                 
                 try:
-                    # Run from DSMC directory so it can find dsm.opt
-                    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=False, timeout=30, cwd=dsmc_dir)
+                    # Run from DSMC directory so it can find dsm.opt; version and
+                    # session share 'query session', so reuse an earlier run
+                    result = outputs.get(cmd)
+                    if result is None:
+                        result = outputs[cmd] = subprocess.run(list(cmd), capture_output=True, text=True, check=False, timeout=30, cwd=dsmc_dir)
                     if result.returncode == 0 and result.stdout:
                         # Parse the output
-                        parsed_data = getattr(DSMCParser, f'parse_q_{query}')(result.stdout)
+                        parsed_data = parse(result.stdout)
                         if parsed_data:
                             results[query] = parsed_data
                         else:
@@ -322,20 +323,16 @@ def main():
     else:
         # Linux Ansible mode
         dsmc = module
-        for query in queries:
+        outputs = {}
+        for query, command, parse in QUERIES:
             if dsmc.params.get(f'q_{query}'):
-                # Special handling for different query types
-                if query == 'version':
-                    rc, output, _ = dsmc.run_command('query session', auto_exit=False)
-                elif query == 'systeminfo':
-                    rc, output, _ = dsmc.run_command('query systeminfo', auto_exit=False)
-                elif query == 'options':
-                    rc, output, _ = dsmc.run_command('query options', auto_exit=False)
-                else:
-                    rc, output, _ = dsmc.run_command(f'query {query}', auto_exit=False)
+                # version and session both run 'query session'; run it once
+                if command not in outputs:
+                    outputs[command] = dsmc.run_command(list(command), auto_exit=False)
+                rc, output, _ = outputs[command]
                 
                 if rc == 0:
-                    results[f'q_{query}'] = getattr(DSMCParser, f'parse_q_{query}')(output)
+                    results[f'q_{query}'] = parse(output)
 
     mapped_result = BAClientResponseMapper.map_to_developer_friendly(results)
 
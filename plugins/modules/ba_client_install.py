@@ -1,4 +1,5 @@
 #!/usr/bin/python3
+import os
 import sys
 import json
 import platform
@@ -15,7 +16,7 @@ except Exception:
 
 try:
     # When running as real Ansible module (Linux)
-    from ..module_utils.ba_client_utils import BAClientHelper  # type: ignore
+    from ..module_utils.ba_client_utils import BAClientHelper, UPGRADE_BACKUP_DIR  # type: ignore
 except ImportError:
     # When running as standalone script (Windows via win_command)
     import sys
@@ -26,7 +27,7 @@ except ImportError:
 
     sys.path.insert(0, UTILS_PATH)
 
-    from ba_client_utils import BAClientHelper  # type: ignore
+    from ba_client_utils import BAClientHelper, UPGRADE_BACKUP_DIR  # type: ignore
 
 
 DOCUMENTATION = '''
@@ -45,7 +46,7 @@ Description:
     - state=absent: uninstall the BA Client and clean up associated components.
 
   For Linux hosts, the module uses package operations (tar extraction / rpm install) and checks existing installations via rpm.
-  For Windows hosts, the module uses registry and Win32_Product queries for detection and silent installer/uninstaller logic.
+  For Windows hosts, the module uses registry queries (including the Uninstall key) for detection and silent installer/uninstaller logic.
 
 Options:
   package_source:
@@ -280,7 +281,7 @@ def main():
                 module.exit_json(changed=False, msg="BA Client already installed after extraction check")
 
         # Pre-checks
-        precheck = utils.verify_system_prereqs()
+        precheck = utils.verify_system_prereqs(install_path)
         module.log(f"Precheck completed: {precheck}")
 
         # Check package
@@ -327,7 +328,11 @@ def main():
             module.exit_json(**upgrade_result)
         except Exception as upgrade_error:
             module.log(f"Upgrade failed: {upgrade_error}")
-            utils.rollback(action="upgrade", previous_version=installed_version)  # <-- ROLLBACK upgrade
+            utils.rollback(
+                action="upgrade",
+                previous_version=installed_version,
+                backup_dir=os.path.join(temp_dir, UPGRADE_BACKUP_DIR)
+            )  # <-- ROLLBACK upgrade
             module.exit_json(changed=False, msg=f"Upgrade failed and rollback executed: {upgrade_error}")
 
     elif state == 'absent':
@@ -97,6 +97,7 @@ EXAMPLES = '''
 '''
 
 from ..module_utils.dsmc_adapter import DsmcAdapter
+import shlex
 
 def main():
     argument_spec = dict(
@@ -139,18 +140,24 @@ def main():
         "dirsonly",
         "removeoperandlimit",
     ]
-    options = ''
+    options = []
     for opt in option_params.keys():
         value = module.params.get(opt)
         if value is not None:
             value = str(value)
             if option_params[opt] in option_params_no_value:
                 if value.lower() == "yes":
-                    options += f" -{option_params[opt]}"
+                    options.append(f"-{option_params[opt]}")
             else:
-                options += f" -{option_params[opt]}={value}"
+                options.append(f"-{option_params[opt]}={value}")
 
-    rc, output, error = module.perform_action(backup_action, filespec, options)
+    # filespec is documented as a space-separated list; split only that value
+    try:
+        filespecs = shlex.split(filespec)
+    except ValueError as e:
+        module.fail_json(msg=f"Invalid filespec {filespec!r}: {e}")
+
+    rc, output, error = module.perform_action(backup_action, filespecs, options)
 
 if __name__ == "__main__":
     main()
@@ -268,6 +268,9 @@ ARTIFACT_PATTERNS = {
     "aix": r"([0-9]+(?:\\.[0-9]+){1,3})-[A-Za-z0-9_-]+-AixPPC\\.bin$",
 }
 
+# Installation Manager offering id in uninstall output, e.g. com.tivoli.dsm.server_8.2.0.20251121_0706
+SERVER_OFFERING_RE = re.compile(r'com\.tivoli\.dsm\.server_(\S+)')
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # ---------- Logging setup ----------
@@ -370,9 +373,13 @@ class BA_SERVER_SETUP:
                 query_cmd = 'sc query state= all | findstr /i "DB2"'
                 result = utils1.exec_run(cmd=query_cmd, context=self.ctx)
                 if result.get('rc') == 0 and result.get('stdout'):
-                    # Extract service names from output
-                    import re
-                    service_names = re.findall(r'SERVICE_NAME:\s+(\S+)', result.get('stdout', ''))
+                    # Extract service names from the "SERVICE_NAME: <name>" lines
+                    service_names = []
+                    for line in result.get('stdout', '').splitlines():
+                        key, _, value = line.partition(':')
+                        fields = value.split(None, 1)
+                        if key.strip() == 'SERVICE_NAME' and fields:
+                            service_names.append(fields[0])
                     self.log.info(f"Found DB2 services: {service_names}")
                     
                     # Stop and remove each DB2 service
@@ -780,8 +787,7 @@ class BA_SERVER_SETUP:
             version_info = "Unknown"
             if "stdout" in resp and resp["stdout"]:
                 # Parse output like: "Uninstalled com.tivoli.dsm.server_8.2.0.20251121_0706 from..."
-                import re
-                match = re.search(r'com\.tivoli\.dsm\.server_(\S+)', resp["stdout"])
+                match = SERVER_OFFERING_RE.search(resp["stdout"])
                 if match:
                     version_info = match.group(1)
             
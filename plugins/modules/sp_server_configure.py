@@ -265,15 +265,14 @@ class SPServerConfiguration:
             ]
             
             for dir_path in directories:
-                if not utils1.fs_exists(dir_path):
-                    cmd = f'mkdir "{dir_path}"'
-                    resp = self._run_cmd(cmd, f"Creating directory {dir_path}", fail_ok=True)
-                    if resp["status"]:
-                        self.log.info(f"Created directory: {dir_path}")
-                    else:
-                        self.log.warning(f"Directory may already exist: {dir_path}")
-                else:
+                # Create directly; no exists() probe and no cmd.exe mkdir per directory
+                try:
+                    os.makedirs(dir_path)
+                    self.log.info(f"Created directory: {dir_path}")
+                except FileExistsError:
                     self.log.info(f"Directory already exists: {dir_path}")
+                except OSError as e:
+                    self.log.warning(f"Could not create directory {dir_path}: {e}")
             
             self.log.info("Windows storage preparation completed successfully")
             return make_result(True, "Windows storage preparation successful", {
@@ -317,6 +317,10 @@ def version_is_newer(current: Optional[str], candidate: str) -> bool:
 # Artifact helpers
 # -----------------------------
 
+# Fallback version finder for artifact patterns without a capture group
+_VERSION_FINDER_RE = re.compile(r"(\d+(?:[._-]\d+)*)", re.IGNORECASE)
+
+
 def artifacts_find_best(
     oskey: str,
     base_dir: str | Path,
@@ -345,9 +349,6 @@ def artifacts_find_best(
         flags = re.IGNORECASE if case_insensitive else 0
         pat = re.compile(expr, flags)
 
-    # Fallback version finder if the main pattern has no capture group
-    version_finder = re.compile(r"(\d+(?:[._-]\d+)*)", re.IGNORECASE)
-
     files = base.rglob("*") if recursive else base.iterdir()
     matches: list[tuple[Path, str]] = []
 
@@ -369,7 +370,7 @@ def artifacts_find_best(
 
         if not ver:
             # Fallback: try to infer version from filename
-            fm = version_finder.search(p.stem)
+            fm = _VERSION_FINDER_RE.search(p.stem)
             ver = fm.group(1) if fm else p.stem  # last resort: whole stem
 
         matches.append((p, ver))
@@ -0,0 +1,79 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+# module_utils are imported the same way the standalone (no-ansible) entry
+# points import them, so the helpers can be tested without a collection path.
+MODULE_UTILS = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "plugins", "module_utils")
+)
+if MODULE_UTILS not in sys.path:
+    sys.path.insert(0, MODULE_UTILS)
+
+
+class FailJson(Exception):
+    pass
+
+
+class FakeModule:
+    """Records every command and answers it through ``handler(cmd) -> (rc, out, err)``."""
+
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda cmd: (0, "", ""))
+        self.commands = []
+        self.warnings = []
+        self.logs = []
+
+    def run_command(self, cmd, use_unsafe_shell=False):
+        self.commands.append(cmd)
+        return self.handler(cmd)
+
+    def fail_json(self, **kwargs):
+        raise FailJson(kwargs.get("msg"))
+
+    def exit_json(self, **kwargs):
+        raise SystemExit(0)
+
+    def warn(self, msg):
+        self.warnings.append(msg)
+
+    def log(self, msg):
+        self.logs.append(msg)
+
+
+@pytest.fixture
+def fake_module():
+    return FakeModule
+
+
+@pytest.fixture
+def fail_json_error():
+    """The exception FakeModule.fail_json raises."""
+    return FailJson
+
+
+@pytest.fixture(autouse=True)
+def host_fs(monkeypatch, tmp_path):
+    """
+    Keep the helpers off the real host: shutil copies and removals that touch
+    a path outside tmp_path are recorded as (name, path) and not performed.
+    Recorded copies raise FileNotFoundError, as if the source were missing.
+    """
+    calls = []
+    root = os.path.join(str(tmp_path), "")
+
+    def guarded(name, real):
+        def op(path, *args, **kwargs):
+            paths = [path] if name == "rmtree" else [path, args[0] if args else kwargs["dst"]]
+            if all(os.path.abspath(str(p)).startswith(root) for p in paths):
+                return real(path, *args, **kwargs)
+            calls.append((name, str(path)))
+            if name != "rmtree":
+                raise FileNotFoundError(path)
+        return op
+
+    for name in ("copy", "copy2", "rmtree"):
+        monkeypatch.setattr(shutil, name, guarded(name, getattr(shutil, name)))
+    return calls
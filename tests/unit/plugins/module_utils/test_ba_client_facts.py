@@ -0,0 +1,23 @@
+import subprocess
+
+import ba_client_facts
+from ba_client_facts import DsmcAdapterExtended
+
+
+def test_run_command_execs_the_argv_it_is_given(monkeypatch):
+    seen = {}
+
+    def run(argv, **kwargs):
+        seen["argv"] = argv
+        return subprocess.CompletedProcess(argv, 0, "ok", "")
+    monkeypatch.setattr(ba_client_facts.subprocess, "run", run)
+    monkeypatch.setattr(ba_client_facts, "_IS_AIX", False)
+    monkeypatch.setattr(ba_client_facts, "_IS_WINDOWS", False)
+    # skip __init__: with ansible installed it would parse module args
+    adapter = DsmcAdapterExtended.__new__(DsmcAdapterExtended)
+    adapter.node_name, adapter.password, adapter.json_output = "node", "pa'ss", {}
+
+    rc, out, _ = adapter.run_command(["query", "filespace", "/data/it's here"], auto_exit=False)
+
+    assert (rc, out) == (0, "ok")
+    assert seen["argv"] == ["dsmc", "query", "filespace", "/data/it's here"]
@@ -0,0 +1,12 @@
+from ba_client_updated_linux_win_aix import BAClientHelper
+
+
+def test_upgrade_skips_when_versions_differ_only_by_trailing_zero(fake_module):
+    module = fake_module(lambda cmd: (0, "8.1.25.0\n", ""))
+    helper = BAClientHelper(module)
+    helper._is_linux, helper._is_windows, helper._is_aix = True, False, False
+
+    result = helper.upgrade_ba_client("/tmp/unused.tar", "8.1.25", "/opt/tivoli/tsm/client/ba/bin", "8.1.25", "present", "/tmp/unused")
+
+    assert result["changed"] is False
+    assert [cmd[:2] for cmd in module.commands] == [["rpm", "-q"]]
@@ -0,0 +1,302 @@
+import re
+import tarfile
+
+import pytest
+
+import ba_client_utils
+from ba_client_utils import BAClientHelper
+
+OLD_RELEASE = {"TIVsm-API64": "8.1.27-0", "TIVsm-BA": "8.1.27-0", "gskcrypt64": "8.0-55.34"}
+
+
+class FakeRpm:
+    """
+    Stateful stand-in for rpm: -qa lists, -e removes, -i installs all files
+    or, like rpm, none of them if a package is already installed, -U
+    installs or replaces, -qp reports a file's NAME|VERSION-RELEASE.
+    File versions come from versions (by path), default 8.1.27-0.
+    fail maps argv[:2] to a canned (rc, out, err).
+    """
+
+    def __init__(self, installed=OLD_RELEASE, fail=None, versions=None):
+        self.installed = dict(installed)
+        self.fail = fail or {}
+        self.versions = versions or {}
+
+    def version_of(self, path):
+        return self.versions.get(path, "8.1.27-0")
+
+    @staticmethod
+    def name_of(path):
+        base = path.rsplit("/", 1)[-1][:-len(".rpm")]
+        return re.match(r"(.+?)(?:-\d|\.x86_64)", base).group(1)
+
+    def __call__(self, cmd):
+        key = tuple(cmd[:2])
+        if key in self.fail:
+            return self.fail[key]
+        if key == ("rpm", "-qa"):
+            return 0, "".join(f"{n}|{v}\n" for n, v in sorted(self.installed.items())), ""
+        if key == ("rpm", "-qp"):
+            return 0, "".join(f"{self.name_of(path)}|{self.version_of(path)}\n" for path in cmd[4:]), ""
+        if key == ("rpm", "-U"):
+            self.installed.update((self.name_of(path), self.version_of(path)) for path in cmd[4:])
+        if key == ("rpm", "-e"):
+            for name in cmd[2:]:
+                self.installed.pop(name, None)
+        if key == ("rpm", "-i"):
+            names = [self.name_of(path) for path in cmd[2:]]
+            clashes = [n for n in names if n in self.installed]
+            if clashes:
+                return 1, "", "".join(f"\tpackage {n}-{self.installed[n]}.x86_64 is already installed\n" for n in clashes)
+            self.installed.update((self.name_of(path), self.version_of(path)) for path in cmd[2:])
+        return 0, "", ""
+
+
+def test_run_cmd_goes_through_run_command(fake_module):
+    module = fake_module(lambda cmd: (3, "", "unit dsmcad.service not loaded"))
+    helper = BAClientHelper(module)
+
+    rc, _, err = helper.run_cmd(["systemctl", "stop", "dsmcad"], check_rc=False)
+
+    assert module.commands == [["systemctl", "stop", "dsmcad"]]
+    assert (rc, err) == (3, "unit dsmcad.service not loaded")
+
+
+def test_run_cmd_fails_with_stderr(fake_module, fail_json_error):
+    helper = BAClientHelper(fake_module(lambda cmd: (1, "", "boom")))
+
+    with pytest.raises(fail_json_error, match="boom"):
+        helper.run_cmd(["false"])
+
+
+def test_rollback_upgrade_warns_when_new_packages_cannot_be_removed(fake_module, tmp_path, host_fs):
+    module = fake_module(FakeRpm(fail={("rpm", "-e"): (1, "", "error: Failed dependencies")}))
+    helper = BAClientHelper(module)
+
+    helper.rollback(action="upgrade", backup_dir=str(tmp_path / "backup"))
+
+    assert ["rpm", "-e", "TIVsm-API64", "TIVsm-BA"] in module.commands
+    assert any("Failed dependencies" in w for w in module.warnings)
+    # config restores from the real install path were only recorded
+    assert ("copy", "/opt/tivoli/tsm/client/ba/bin/dsm.opt.bk") in host_fs
+
+
+IBM_RPMS = [
+    "TIVsm-API64.x86_64.rpm",
+    "TIVsm-APIcit.x86_64.rpm",
+    "TIVsm-BA.x86_64.rpm",
+    "TIVsm-BAcit.x86_64.rpm",
+    "TIVsm-BAhdw.x86_64.rpm",
+    "gskcrypt64-8.0.55.34.linux.x86_64.rpm",
+    "gskssl64-8.0.55.34.linux.x86_64.rpm",
+]
+
+
+def test_reinstall_rpms_matches_ibm_file_names(fake_module, tmp_path):
+    for name in IBM_RPMS:
+        (tmp_path / name).touch()
+    module = fake_module(FakeRpm(installed={}))
+    helper = BAClientHelper(module)
+    order = ["gskcrypt64", "gskssl64", "TIVsm-API64", "TIVsm-APIcit",
+             "TIVsm-BA", "TIVsm-BAcit", "TIVsm-BAhdw", "TIVsm-WEBGUI"]
+
+    results = helper._reinstall_rpms(str(tmp_path), order)
+
+    # one rpm transaction, each file exactly once
+    rpm_calls = [cmd for cmd in module.commands if cmd[:2] == ["rpm", "-i"]]
+    assert len(rpm_calls) == 1
+    assert sorted(p.rsplit("/", 1)[1] for p in rpm_calls[0][2:]) == sorted(IBM_RPMS)
+    by_pkg = {r["package"]: r["rc"] for r in results}
+    assert by_pkg["TIVsm-BA"] == 0 and by_pkg["TIVsm-BAcit"] == 0
+    assert by_pkg["TIVsm-WEBGUI"] is None
+
+
+def test_reinstall_rpms_does_not_confuse_prefixes(fake_module, tmp_path):
+    (tmp_path / "TIVsm-BAcit.x86_64.rpm").touch()
+    helper = BAClientHelper(fake_module(FakeRpm(installed={})))
+
+    results = helper._reinstall_rpms(str(tmp_path), ["TIVsm-BA", "TIVsm-BAcit"])
+
+    assert [r["rc"] for r in results] == [None, 0]
+
+
+def test_reinstall_rpms_without_files_runs_nothing(fake_module, tmp_path):
+    module = fake_module(FakeRpm(installed={}))
+    helper = BAClientHelper(module)
+
+    results = helper._reinstall_rpms(str(tmp_path), ["TIVsm-BA"])
+
+    assert not [cmd for cmd in module.commands if cmd[:2] == ["rpm", "-i"]]
+    assert results[0]["rc"] is None
+
+
+def upgrade_dirs(tmp_path):
+    """temp_dir holding the installed release plus a stale file, and a new package dir."""
+    temp_dir = tmp_path / "baClient"
+    temp_dir.mkdir()
+    (temp_dir / "TIVsm-BA.x86_64.rpm").write_text("old")
+    (temp_dir / "TIVsm-BAhdw.x86_64.rpm").write_text("never installed")
+    new_dir = tmp_path / "new"
+    new_dir.mkdir()
+    (new_dir / "TIVsm-BA.x86_64.rpm").write_text("new")
+    return temp_dir, new_dir
+
+
+def test_linux_upgrade_backs_up_installed_release_before_rpm_upgrade(fake_module, fail_json_error, tmp_path, host_fs):
+    temp_dir, new_dir = upgrade_dirs(tmp_path)
+    rpm = FakeRpm(fail={("rpm", "-U"): (1, "", "error: upgrade failed")})
+
+    def handler(cmd):
+        host_fs.append(("run", cmd))
+        return rpm(cmd)
+
+    helper = BAClientHelper(fake_module(handler))
+
+    with pytest.raises(fail_json_error, match="upgrade failed"):
+        helper.upgrade_ba_client(str(new_dir), "/opt/tivoli/tsm/client/ba/bin", "8.1.28.0", "present", str(temp_dir))
+
+    upgrade_at = next(i for i, (kind, cmd) in enumerate(host_fs) if kind == "run" and cmd[:2] == ["rpm", "-U"])
+    backed_up = [src for kind, src in host_fs[:upgrade_at] if kind == "copy2"]
+    assert backed_up == ["/opt/tivoli/tsm/client/ba/bin/dsm.opt", "/opt/tivoli/tsm/client/ba/bin/dsm.sys"]
+
+    # only the installed release is archived, not the stale TIVsm-BAhdw file
+    backup_dir = temp_dir / ba_client_utils.UPGRADE_BACKUP_DIR
+    with tarfile.open(backup_dir / ba_client_utils.RPM_BACKUP_ARCHIVE) as tf:
+        assert tf.getnames() == ["TIVsm-BA.x86_64.rpm"]
+
+
+def test_rollback_after_failed_rpm_upgrade_only_restores_configs(fake_module, tmp_path, host_fs):
+    backup_dir = tmp_path / "backup"
+    backup_dir.mkdir()
+    module = fake_module(FakeRpm())
+    helper = BAClientHelper(module)
+
+    helper.rollback(action="upgrade", previous_version="8.1.27.0", backup_dir=str(backup_dir))
+
+    assert not [cmd for cmd in module.commands if cmd[:2] in (["rpm", "-e"], ["rpm", "-i"])]
+    assert ("copy", "/opt/tivoli/tsm/client/ba/bin/dsm.opt.bk") in host_fs
+    assert not backup_dir.exists()
+
+
+def test_rollback_after_upgrade_reinstalls_previous_release(fake_module, tmp_path, monkeypatch):
+    temp_dir, new_dir = upgrade_dirs(tmp_path)
+    rpm = FakeRpm(versions={str(new_dir / "TIVsm-BA.x86_64.rpm"): "8.1.28-0"})
+    module = fake_module(rpm)
+    helper = BAClientHelper(module)
+
+    def configure_fails():
+        raise RuntimeError("configure failed")
+    monkeypatch.setattr(helper, "configure_ba_client", configure_fails)
+
+    with pytest.raises(RuntimeError):
+        helper.upgrade_ba_client(str(new_dir), "/opt/tivoli/tsm/client/ba/bin", "8.1.28.0", "present", str(temp_dir))
+    assert rpm.installed["TIVsm-BA"] == "8.1.28-0"
+
+    backup_dir = temp_dir / ba_client_utils.UPGRADE_BACKUP_DIR
+    module.commands.clear()
+    helper.rollback(action="upgrade", previous_version="8.1.27.0", backup_dir=str(backup_dir))
+
+    assert ["rpm", "-i", str(backup_dir / "TIVsm-BA.x86_64.rpm")] in module.commands
+    assert rpm.installed["TIVsm-BA"] == "8.1.27-0"
+    assert any("Rollback successful" in w for w in module.warnings)
+    assert not backup_dir.exists()
+
+
+def test_reinstall_rpms_skips_packages_that_are_still_installed(fake_module, tmp_path):
+    for name in IBM_RPMS:
+        (tmp_path / name).touch()
+    # the upgrade rollback only removes TIVsm packages, gsk stays installed
+    rpm = FakeRpm(installed={"gskcrypt64": "8.0-55.34", "gskssl64": "8.0-55.34"})
+    helper = BAClientHelper(fake_module(rpm))
+
+    results = {r["package"]: r for r in helper._reinstall_rpms(str(tmp_path), ["gskcrypt64", "gskssl64", "TIVsm-API64", "TIVsm-BA"])}
+
+    assert results["gskcrypt64"]["status"] == "already installed"
+    assert results["TIVsm-BA"]["rc"] == 0 and results["TIVsm-API64"]["rc"] == 0
+    assert {"TIVsm-API64", "TIVsm-BA"} <= set(rpm.installed)
+
+
+def test_reinstall_rpms_reports_errors_per_package(fake_module, tmp_path):
+    (tmp_path / "TIVsm-API64.x86_64.rpm").touch()
+    (tmp_path / "TIVsm-BA.x86_64.rpm").touch()
+    err = "\tfile /opt/tivoli/tsm/client/ba/bin/dsmc from install of TIVsm-BA-8.1.27-0.x86_64 conflicts\n"
+    helper = BAClientHelper(fake_module(FakeRpm(installed={}, fail={("rpm", "-i"): (1, "", err)})))
+
+    results = {r["package"]: r for r in helper._reinstall_rpms(str(tmp_path), ["TIVsm-API64", "TIVsm-BA"])}
+
+    assert "conflicts" in results["TIVsm-BA"]["stderr"]
+    assert "conflicts" not in results["TIVsm-API64"]["stderr"]
+    assert results["TIVsm-API64"]["rc"] == 1
+
+
+def test_linux_upgrade_accepts_equivalent_version_string(fake_module, tmp_path, monkeypatch):
+    temp_dir, new_dir = upgrade_dirs(tmp_path)
+    rpm = FakeRpm(versions={str(new_dir / "TIVsm-BA.x86_64.rpm"): "8.1.28-0"})
+    helper = BAClientHelper(fake_module(rpm))
+    for step in ("configure_ba_client", "post_installation_verification", "start_baclient_daemon"):
+        monkeypatch.setattr(helper, step, lambda *args, **kwargs: {})
+
+    # rpm reports 8.1.28.0 for a requested 8.1.28
+    result = helper.upgrade_ba_client(str(new_dir), "/opt/tivoli/tsm/client/ba/bin", "8.1.28", "present", str(temp_dir))
+
+    assert result["changed"] is True
+
+
+class FakeWinreg:
+    """Uninstall keys per registry view: {view: {subkey: {value_name: value}}}."""
+    HKEY_LOCAL_MACHINE = "HKLM"
+    KEY_READ = 0x20019
+    KEY_WOW64_64KEY = 0x0100
+    KEY_WOW64_32KEY = 0x0200
+
+    class Key:
+        def __init__(self, entries):
+            self.entries = entries
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def __init__(self, views):
+        self.views = views
+
+    def OpenKey(self, parent, subkey, reserved=0, access=0):
+        if isinstance(parent, self.Key):
+            return self.Key(parent.entries[subkey])
+        entries = self.views.get(access & ~self.KEY_READ, {})
+        if subkey == ba_client_utils.UNINSTALL_KEY:
+            return self.Key(entries)
+        code = subkey.rsplit("\\", 1)[1]
+        if code not in entries:
+            raise OSError(subkey)
+        return self.Key(entries[code])
+
+    def EnumKey(self, key, index):
+        try:
+            return sorted(key.entries)[index]
+        except IndexError:
+            raise OSError("no more keys")
+
+    def QueryValueEx(self, key, name):
+        if name not in key.entries:
+            raise OSError(name)
+        return key.entries[name], 1
+
+
+def test_installed_products_include_the_32bit_registry_view(monkeypatch):
+    fake = FakeWinreg({
+        FakeWinreg.KEY_WOW64_64KEY: {"{64}": {"DisplayName": "Other Tool"}},
+        FakeWinreg.KEY_WOW64_32KEY: {"IBM SP Client": {
+            "DisplayName": "IBM Storage Protect Client",
+            "QuietUninstallString": r'"C:\Program Files (x86)\IBM\setup.exe" /s /uninstall',
+        }},
+    })
+    monkeypatch.setattr(ba_client_utils, "winreg", fake)
+
+    product = ba_client_utils._find_installed_product("IBM Storage Protect Client")
+
+    assert product == ("IBM SP Client", "IBM Storage Protect Client", FakeWinreg.KEY_WOW64_32KEY)
+    assert ba_client_utils._uninstall_command(product[0], product[2]).endswith("/s /uninstall")